@@ -23,11 +23,11 @@ install_package('pygame')
 install_package('scipy')
 install_package('midiutil')
 install_package('numpy') # Although a dependency, explicit check is good practice
+install_package('numba')
 
 # --- Main Imports ---
 import numpy as np
 import pygame
-import time
 import random
 import tkinter as tk
 from tkinter import scrolledtext, ttk, filedialog, BooleanVar
@@ -40,6 +40,207 @@ import math
 import traceback
 import copy
 import json
+try:
+    import orjson # Optional; settings I/O falls back to the json module without it
+except ImportError:
+    orjson = None
+import heapq
+from collections import OrderedDict
+import queue
+import operator
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import numba
+from numba import njit, prange
+
+# Parallel kernels run on the playback/render worker threads; TBB can hang interpreter shutdown in that case, so prefer OpenMP.
+# workqueue is still the fallback when neither is installed, and it aborts if two threads launch kernels at once, see HarmonizerApp._kernels_threadsafe
+numba.config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
+
+# --- Compiled Kernels ---
+@njit(cache=True)
+def _harmony_figure_kernel(base_note_idx, scale_len, base_scale_len, chord_indices):
+    """Numeric core of _build_harmony_figure: picks up to two extra chord tones around the base note."""
+    roll = np.random.random()
+    num_notes = 1 if roll < 0.7 else 2 if roll < 0.95 else 3
+    notes = np.empty(num_notes, dtype=np.int32)
+    notes[0] = base_note_idx
+    count = 1
+    if num_notes == 1 or chord_indices.size == 0: return notes[:1]
+    octave_offset = (base_note_idx // base_scale_len) * base_scale_len
+    for _ in range(num_notes - 1):
+        new_note = chord_indices[np.random.randint(0, chord_indices.size)] + octave_offset
+        if np.random.random() < 0.3: new_note += (1 if np.random.random() < 0.5 else -1) * base_scale_len
+        new_note = max(0, min(scale_len - 1, new_note))
+        is_duplicate = False
+        for j in range(count):
+            if notes[j] == new_note: is_duplicate = True
+        if not is_duplicate:
+            notes[count] = new_note; count += 1
+    return np.sort(notes[:count])
+
+@njit(cache=True)
+def _melodic_interval_kernel(intervals, base_probs, tension, target_direction, contour_bias, last_direction, consecutive_steps):
+    """Numeric core of _generate_melodic_note: weights the transition table and draws the next interval."""
+    weights = base_probs.copy()
+    for k in range(intervals.size):
+        interval = intervals[k]
+        # Apply tension: Higher tension favors larger/rarer intervals
+        if abs(interval) > 2: weights[k] *= (1 + tension)
+        elif abs(interval) <= 1: weights[k] *= (1 - tension * 0.5)
+        if target_direction != 0 and interval == target_direction: weights[k] *= 5 # Strong bias
+    for k in range(intervals.size):
+        if intervals[k] == contour_bias: weights[k] *= 1.5
+    for k in range(intervals.size):
+        if intervals[k] == last_direction: weights[k] *= 1.2 # Inertia
+    if consecutive_steps > 3:
+        for k in range(intervals.size):
+            if intervals[k] == -last_direction: weights[k] *= 1.8 # Break long runs
+    cumulative = np.cumsum(weights)
+    roll = np.random.random() * cumulative[-1]
+    for k in range(intervals.size):
+        if roll < cumulative[k]: return intervals[k]
+    return intervals[-1]
+
+@njit(cache=True)
+def _melodic_step_kernel(current_note_index, scale_length, intervals, base_probs, tension, target_note_idx, contour_code, phrase_progress, last_direction, consecutive_steps):
+    """Whole numeric step of _generate_melodic_note. target_note_idx < 0 means no target; contour_code: 0 none, 1 rising, 2 falling, 3 arch, 4 valley.
+    Returns (next_note_index, next_direction, consecutive_steps, chosen_interval)."""
+    target_direction = 0
+    if target_note_idx >= 0: target_direction = 1 if target_note_idx > current_note_index else (-1 if target_note_idx < current_note_index else 0)
+    contour_bias = 0
+    if contour_code == 1: contour_bias = 1
+    elif contour_code == 2: contour_bias = -1
+    elif contour_code == 3: contour_bias = 1 if phrase_progress < 0.5 else -1
+    elif contour_code == 4: contour_bias = -1 if phrase_progress < 0.5 else 1
+    chosen_interval = _melodic_interval_kernel(intervals, base_probs, tension, target_direction, contour_bias, last_direction, consecutive_steps)
+    next_direction = 1 if chosen_interval > 0 else (-1 if chosen_interval < 0 else 0)
+    consecutive_steps_new = consecutive_steps + 1 if next_direction == last_direction else 1
+    next_note_index = max(0, min(scale_length - 1, current_note_index + chosen_interval))
+    return next_note_index, next_direction, consecutive_steps_new, chosen_interval
+
+@njit(parallel=True, nogil=True, fastmath=True, cache=True)
+def _mix_events_kernel(track, starts, lengths, segs_flat, seg_offsets, gains, left_gain, right_gain, fade_samples):
+    """Adds flattened mono segments into a stereo track. Each parallel worker owns a disjoint block of output samples, so overlapping notes never race.
+    Events must be sorted by start: each block then only visits the window of events that can reach it, and streams through its samples in start order.
+    Every segment is faded in and out with the two halves of a Hann window of up to fade_samples per side (at most half its length; none if that is 1 or less)."""
+    num_samples = track.shape[0]
+    if starts.size == 0: return
+    block_size = 16384
+    max_length = lengths.max()
+    for block in prange((num_samples + block_size - 1) // block_size):
+        block_start = block * block_size
+        block_end = min(num_samples, block_start + block_size)
+        # Only events starting in (block_start - max_length, block_end) can overlap this block
+        first = np.searchsorted(starts, block_start - max_length, side='right')
+        last = np.searchsorted(starts, block_end, side='left')
+        for e in range(first, last):
+            lo, hi = max(starts[e], block_start), min(starts[e] + lengths[e], block_end)
+            if lo >= hi: continue
+            seg_base = seg_offsets[e] - starts[e]
+            fade = min(fade_samples, lengths[e] // 2)
+            if fade <= 1: fade = 0
+            fade_in_end, fade_out_start = starts[e] + fade, starts[e] + lengths[e] - fade
+            window_step = 2.0 * np.pi / (2 * fade - 1)
+            for i in range(lo, hi):
+                value = segs_flat[seg_base + i] * gains[e]
+                if i < fade_in_end: value *= 0.5 - 0.5 * math.cos(window_step * (i - starts[e]))
+                elif i >= fade_out_start: value *= 0.5 - 0.5 * math.cos(window_step * (i - fade_out_start + fade))
+                track[i, 0] += value * left_gain
+                track[i, 1] += value * right_gain
+
+@njit(nogil=True, cache=True)
+def _sumsq_and_absmax_kernel(segment):
+    """Returns the sum of squares and the absolute peak of a segment in a single scan."""
+    sumsq, peak = 0.0, 0.0
+    for i in range(segment.size):
+        v = segment[i]
+        sumsq += v * v
+        if abs(v) > peak: peak = abs(v)
+    return sumsq, peak
+
+@njit(parallel=True, cache=True)
+def _layer_probe_kernel(n):
+    """Smallest possible parallel launch; it makes Numba load its threading layer so numba.threading_layer() can report it."""
+    total = 0
+    for i in prange(n): total += i
+    return total
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _mixdown_kernel(melody, harmony, drums, melody_gain, harmony_gain, drum_gain, out):
+    """Sums the three gain-scaled stems into the master buffer in one sweep."""
+    for i in prange(out.shape[0]):
+        for c in range(out.shape[1]):
+            out[i, c] = melody[i, c] * melody_gain + harmony[i, c] * harmony_gain + drums[i, c] * drum_gain
+
+@njit(parallel=True, cache=True)
+def _float_to_int16_kernel(track, out):
+    """Clips, scales and converts a stereo float track to int16 PCM in a single pass."""
+    for i in prange(track.shape[0]):
+        for c in range(track.shape[1]):
+            out[i, c] = np.int16(min(1.0, max(-1.0, track[i, c])) * 32767.0)
+
+@njit(parallel=True, cache=True)
+def _float_to_pcm24_kernel(track, out):
+    """Clips, scales and packs a stereo float track into little-endian 24-bit PCM bytes (3 bytes per sample)."""
+    num_channels = track.shape[1]
+    for i in prange(track.shape[0]):
+        for c in range(num_channels):
+            v = np.int32(min(1.0, max(-1.0, np.float64(track[i, c]))) * 8388607.0)
+            k = 3 * (i * num_channels + c)
+            out[k] = v & 0xff
+            out[k + 1] = (v >> 8) & 0xff
+            out[k + 2] = (v >> 16) & 0xff
+
+@njit(parallel=True, nogil=True, cache=True)
+def _basic_waves_kernel(out, freqs, t_step, shape):
+    """Writes the sum of one basic oscillator per frequency into out. shape: 0 sine, 1 square, 2 sawtooth, 3 triangle."""
+    two_pi = 2.0 * np.pi
+    for i in prange(out.size):
+        t = i * t_step
+        acc = 0.0
+        for f in freqs:
+            if shape <= 1:
+                s = math.sin(f * t * 2 * np.pi)
+                if shape == 0: acc += s
+                else: acc += 1.0 if s > 0.0 else (-1.0 if s < 0.0 else 0.0)
+            else:
+                # Same phase arithmetic as scipy.signal.sawtooth, so wrap points land on the same samples
+                tmod = (two_pi * f * t) % two_pi
+                if shape == 2: acc += tmod / np.pi - 1.0
+                else: acc += tmod / (np.pi * 0.5) - 1.0 if tmod < np.pi else (np.pi * 1.5 - tmod) / (np.pi * 0.5)
+        out[i] = acc
+
+@njit(parallel=True, nogil=True, fastmath=True, cache=True)
+def _decaying_partials_kernel(out, t_step, partial_freqs, decay_fast, decay_slow, partial_amps, amp_fast, beating_factor):
+    """Writes a sum of exponentially decaying sine partials into out. Each partial has a fast component and a slow one detuned by beating_factor; amp_fast=1 gives plain partials."""
+    two_pi = 2.0 * np.pi
+    for i in prange(out.size):
+        t = i * t_step
+        acc = 0.0
+        for k in range(partial_freqs.size):
+            f = partial_freqs[k]
+            acc += partial_amps[k] * (amp_fast * math.sin(two_pi * f * t) * math.exp(-decay_fast[k] * t) + (1 - amp_fast) * math.sin(two_pi * f * beating_factor * t) * math.exp(-decay_slow[k] * t))
+        out[i] = acc
+
+# --- Waveform Helpers ---
+# Closed-form equivalents of scipy.signal.sawtooth/square for scalar width/duty, as plain ufunc expressions
+def _sawtooth_wave(phase):
+    """signal.sawtooth(phase): rises from -1 to 1 over each 2*pi period."""
+    return np.mod(phase, 2 * np.pi) / np.pi - 1
+
+def _triangle_wave(phase):
+    """signal.sawtooth(phase, width=0.5): -1 at the period start, 1 at its midpoint."""
+    return 1 - 2 * np.abs(np.mod(phase, 2 * np.pi) / np.pi - 1)
+
+def _square_wave(phase):
+    """signal.square(phase): 1 for the first half of each 2*pi period, -1 for the second."""
+    return np.where(np.mod(phase, 2 * np.pi) < np.pi, 1.0, -1.0)
+
+# --- Event Helpers ---
+def _copy_event(event):
+    """Copies a note or drum event dict. Its only mutable values are flat lists (freqs, scale_idx), so a one-level copy replaces copy.deepcopy."""
+    return {k: (v.copy() if isinstance(v, list) else v) for k, v in event.items()}
 
 class SpeciesCounterpointEngine:
     """
@@ -91,7 +292,7 @@ class SpeciesCounterpointEngine:
 
             m2_idx = max(0, min(len(self.scale_notes) - 1, candidate_idx))
             
-            new_event = copy.deepcopy(event)
+            new_event = _copy_event(event)
             new_event.update({
                 'scale_idx': [m2_idx],
                 'freqs': [self.scale_notes[m2_idx]],
@@ -106,26 +307,65 @@ class SpeciesCounterpointEngine:
         return events
 
 class HarmonizerApp:
+    _scale_tables = None # (SCALE_TABLE, SCALE_LENGTHS, SCALE_INDEX, MUSICAL_SCALES) shared by every instance, see __init__
+
     def __init__(self, master, ui_mode=True):
         self.master = master
         self.ui_mode = ui_mode
+        if not ui_mode: self.update_log = self._update_log_headless # Chosen once; headless logging never needs the Tk checks
+        self.MIXER_BUFFER = 4096 # Samples per SDL audio callback; songs are fully pre-rendered, so fewer callbacks matter more than the ~93 ms start/stop latency
+        self.MIXER_QUIT_TIMEOUT = 0.5 # Seconds reload_script waits for pygame.mixer.quit before restarting regardless
+        self.WAV_EXPORT_CHUNK_FRAMES = 65536 # Stereo frames converted and written per step by export_wav_file
+        self.EXPORT_POLL_MS = 100 # How often the UI checks whether a running export has finished, see _watch_export
         
+        self.melody_channel = None
+        self.harmony_channel = None
+        self.drum_channel = None
+
         if self.ui_mode:
             master.title("Harmonizer (Advanced Logic)")
             master.geometry("850x800")
-            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=1024) # Changed to stereo
+            self._init_mixer()
             master.protocol("WM_DELETE_WINDOW", self.on_closing)
             master.configure(bg='#2e2e2e')
 
         self.SETTINGS_FILE = "harmonizer_settings.json"
-        
-        self.melody_channel = None
-        self.harmony_channel = None
-        self.drum_channel = None
-        
-        self.lock = threading.Lock()
+        self.SETTINGS_SAVE_DELAY_MS = 250 # Quiet period after the last settings change before the file is written, see _save_settings
+        self._save_after_id = None
+        self._settings_write_lock = threading.Lock() # Serializes background settings writes with the final one on close
+        self._settings_seq, self._settings_written_seq = 0, 0 # Snapshot numbers, so a writer that gets the lock late never overwrites newer settings
+        self._settings_writer = None # Latest background settings writer, joined before the final save
+        self.VOLUME_APPLY_INTERVAL_MS = 30 # Slider drags push channel volumes at most this often, see _set_target_volume
+        self._target_volumes = {'melody': 0.7, 'harmony': 0.7, 'drums': 0.7} # Latest slider volumes as plain floats, readable from any thread
+        self._volume_apply_id = None
+        
+        self._busy = threading.Event() # Set while a generation or replay owns the mixer channels, see _claim_busy
         self.music_thread = None
+        self.export_thread = None
         self.stop_event = threading.Event()
+        self._log_after_ids = [] # Pending Tk callbacks for the playback log timeline
+        self._concurrent_render = None # Whether the render threads may launch parallel kernels at once; decided on first use, see _kernels_threadsafe
+        self._render_bufs = None # Stem and master render buffers, reused by every song that fits, see _get_bufs
+        self._int16_scratch = np.empty((0, 2), dtype=np.int16) # PCM staging for pygame, which copies each stem out of it
+        self._drum_cache = {} # (drum_type, duration, sample_rate) -> rendered drum hit
+        self._log_queue = queue.SimpleQueue() # Log lines from worker threads, written to the widgets by _drain_log_queue
+        self.LOG_DRAIN_INTERVAL_MS, self.LOG_DRAIN_BATCH = 50, 200
+        self.LOG_MAX_LINES = 2000 # Older lines are dropped from each log widget beyond this, see _trim_log_widget
+        self.LOG_NAVIGATION_KEYS = {'Left', 'Right', 'Up', 'Down', 'Prior', 'Next', 'Home', 'End'} # Keys the read-only log widgets still accept
+        self.DRUM_CACHE_SIZE = 128
+        self._tone_cache = OrderedDict() # (freqs, waveform, duration, sample_rate) -> rendered tone, least recently used first
+        self._tone_cache_lock = threading.Lock() # Pitched parts and the tom drum synthesize from different render threads
+        self.TONE_CACHE_SIZE = 512
+        self._tone_templates = OrderedDict() # (tone key, output sample_rate) -> (mix-ready float32 tone, normalization gain), see _tone_template
+        self._scratch = threading.local() # Per-thread float64 work buffer for partial sums, see _get_scratch
+        self._t_cache = {} # (duration, sample_rate) -> time axis, see _time_axis
+        self.T_CACHE_SIZE = 256
+        self._sample_index = np.arange(int(8.0 * 44100), dtype=np.float64) # 0, 1, 2, ... shared by every time axis; grows on demand
+        self._env_cache = {} # Envelope shape parameters -> envelope array, see _adsr_envelope and _decay_envelope
+        self.ENV_CACHE_SIZE = 256
+        self._sos_cache = {} # (order, cutoff_hz, btype, sample_rate) -> Butterworth SOS coefficients, see _butter_sos
+        self._noise_pool = np.random.default_rng().uniform(-1, 1, 5 * 44100) # White noise that drum hits slice into, see _white_noise
+        self._noise_pool.setflags(write=False)
         
         self.last_song_data, self.last_drum_data, self.last_master_audio, self.last_melody_bpm = None, None, None, None
         self.last_bit_depth, self.last_sample_rate = 24, 44100
@@ -140,6 +380,12 @@ class HarmonizerApp:
         
         self.RESONANT_WAVEFORMS = {'Piano', 'Guitar', 'Violin', 'Cello'}
         self.MIN_RESONANT_DURATION = 0.25 # in seconds
+        self.INSTRUMENT_WAVEFORMS = {'Piano', 'Violin', 'Cello', 'Guitar', 'Rich Saw', 'Hollow Square'} # Modelled per note; everything else is a basic oscillator
+        self.BASIC_WAVE_SHAPES = {'Sine': 0, 'Square': 1, 'Sawtooth': 2, 'Triangle': 3} # Shape ids for _basic_waves_kernel; unknown names fall back to sine
+        self.ROLLOFF_WAVEFORMS = {'Square', 'Sawtooth', 'Triangle', 'Rich Saw', 'Violin', 'Guitar'} # Bright timbres attenuated above A4
+        self.CONTOUR_CODES = {'rising': 1, 'falling': 2, 'arch': 3, 'valley': 4} # Contour names as passed to _melodic_step_kernel
+        self.PART_STEMS = {'melody1': 'melody', 'melody2': 'melody', 'bass': 'harmony', 'chords': 'harmony'}
+        self.BASS_SAMPLE_RATE = None # e.g. 14700 to synthesize bass tones at a third of the rate and polyphase-upsample them; None keeps full-rate bass
 
         # --- Parameters, constants, and helper dictionaries ---
         self.NOTE_FREQUENCIES = {
@@ -259,13 +505,27 @@ class HarmonizerApp:
             -7: 0.02, 7: 0.02, # Fifths/Octaves
             -12: 0.01, 12: 0.01
         }
+        self.TRANSITION_INTERVALS = np.array(list(self.TWO_NOTE_TRANSITIONS.keys()), dtype=np.int64)
+        self.TRANSITION_PROBS = np.array(list(self.TWO_NOTE_TRANSITIONS.values()), dtype=np.float64)
         
         self.form_types = ["Standard", "Ternary", "Rondo", "Sonata", "AABA", "Theme and Variations"]
 
-        self.MUSICAL_SCALES = {}
-        for note, base_freq in self.NOTE_FREQUENCIES.items():
-            for scale_name, intervals in self.INTERVAL_NAMES.items():
-                 self.MUSICAL_SCALES[f"{note} {scale_name}"] = [base_freq * (2**(interval/12)) for interval in intervals]
+        # Every scale as one (root, mode, degree) frequency table; rows are NaN-padded past each mode's length.
+        # The tables only depend on the constants above, so the first instance builds them and later ones share them read-only
+        if HarmonizerApp._scale_tables is None:
+            scale_modes = list(self.INTERVAL_NAMES.values())
+            intervals_pad = np.full((len(scale_modes), max(len(intervals) for intervals in scale_modes)), np.nan)
+            for mode_idx, intervals in enumerate(scale_modes): intervals_pad[mode_idx, :len(intervals)] = intervals
+            scale_table = np.array(list(self.NOTE_FREQUENCIES.values()))[:, np.newaxis, np.newaxis] * 2 ** (intervals_pad[np.newaxis] / 12)
+            scale_lengths = np.array([len(intervals) for intervals in scale_modes])
+            scale_table.setflags(write=False); scale_lengths.setflags(write=False)
+            scale_index = {f"{note} {scale_name}": (root_idx, mode_idx) for root_idx, note in enumerate(self.NOTE_FREQUENCIES) for mode_idx, scale_name in enumerate(self.INTERVAL_NAMES)}
+            # Name-keyed list view of the table, which the generators slice and concatenate
+            musical_scales = {name: scale_table[root_idx, mode_idx, :scale_lengths[mode_idx]].tolist() for name, (root_idx, mode_idx) in scale_index.items()}
+            HarmonizerApp._scale_tables = (scale_table, scale_lengths, scale_index, musical_scales)
+        self.SCALE_TABLE, self.SCALE_LENGTHS, self.SCALE_INDEX, self.MUSICAL_SCALES = HarmonizerApp._scale_tables
+        self.RELATED_KEY_INTERVALS = {'dominant': 7, 'subdominant': 5, 'relative_major': 3, 'relative_minor': -3, 'chromatic_mediant_up': 4, 'chromatic_mediant_down': -4, 'tritone': 6}
+        self.RELATED_KEYS = {(name, relation): self._compute_related_key(name, relation) for name in self.MUSICAL_SCALES for relation in self.RELATED_KEY_INTERVALS} # See _get_related_key
 
         self.DIATONIC_CHORDS = {
             'Major': {'I': [0, 2, 4], 'ii': [1, 3, 5], 'iii': [2, 4, 6], 'IV': [3, 5, 7], 'V': [4, 6, 8], 'vi': [5, 7, 9], 'vii°': [6, 8, 10]},
@@ -351,6 +611,11 @@ class HarmonizerApp:
         }
         self.MIDI_INSTRUMENT_NAMES = sorted(self.MIDI_INSTRUMENTS.keys(), key=lambda k: self.MIDI_INSTRUMENTS[k])
 
+        # Warm up the compiled kernels so the first song doesn't pay the JIT cost
+        _harmony_figure_kernel(14, 28, 7, np.array([0, 2, 4], dtype=np.int32))
+        _melodic_step_kernel(7, 28, self.TRANSITION_INTERVALS, self.TRANSITION_PROBS, 0.5, -1, 0, 0.0, 0, 0)
+        _basic_waves_kernel(np.empty(8, dtype=np.float32), np.array([440.0]), 1.0 / 44100, 0)
+        _decaying_partials_kernel(np.empty(8), 1.0 / 44100, np.array([440.0]), np.array([6.0]), np.array([0.2]), np.array([1.0]), 0.6, 1.0005)
 
         if self.ui_mode:
             self.form_vars = {ft: BooleanVar(value=(ft == "Standard")) for ft in self.form_types}
@@ -369,6 +634,7 @@ class HarmonizerApp:
         if self.ui_mode:
             self.entry_duration.bind("<KeyRelease>", self._save_settings)
             self.bit_depth_var.trace("w", self._save_settings)
+            self.master.after(self.LOG_DRAIN_INTERVAL_MS, self._drain_log_queue)
 
     def _setup_ui(self):
         style = ttk.Style(); style.theme_use('clam'); style.configure("TScale", background="#2e2e2e", troughcolor="#444444")
@@ -426,7 +692,7 @@ class HarmonizerApp:
         # Main Log
         main_log_frame = tk.Frame(frame, bg='#2e2e2e'); main_log_frame.pack(pady=5, fill=tk.X)
         tk.Label(main_log_frame, text="Main Events Log", bg='#2e2e2e', fg='white').pack()
-        self.main_log_area = scrolledtext.ScrolledText(main_log_frame, wrap=tk.WORD, height=6, state='disabled', bg='black', fg='white'); self.main_log_area.pack(fill=tk.X)
+        self.main_log_area = scrolledtext.ScrolledText(main_log_frame, wrap=tk.WORD, height=6, bg='black', fg='white'); self.main_log_area.pack(fill=tk.X); self._make_log_read_only(self.main_log_area)
         self.main_log_area.tag_config('main', foreground='lightblue')
 
         # Log and Export Grid
@@ -436,24 +702,25 @@ class HarmonizerApp:
         grid_frame.grid_rowconfigure(2, weight=1)
         
         melody1_log_frame = tk.LabelFrame(grid_frame, text="Melody 1 Log", bg='#2e2e2e', fg='white'); melody1_log_frame.grid(row=0, column=0, sticky='nsew', padx=2, pady=2)
-        self.melody1_log_area = scrolledtext.ScrolledText(melody1_log_frame, wrap=tk.WORD, height=5, state='disabled', bg='black', fg='lightgreen'); self.melody1_log_area.pack(fill=tk.BOTH, expand=True)
+        self.melody1_log_area = scrolledtext.ScrolledText(melody1_log_frame, wrap=tk.WORD, height=5, bg='black', fg='lightgreen'); self.melody1_log_area.pack(fill=tk.BOTH, expand=True); self._make_log_read_only(self.melody1_log_area)
         self.melody1_log_area.tag_config('melody1', foreground='lightgreen')
         
         bass_log_frame = tk.LabelFrame(grid_frame, text="Bass Log", bg='#2e2e2e', fg='white'); bass_log_frame.grid(row=0, column=1, sticky='nsew', padx=2, pady=2)
-        self.bass_log_area = scrolledtext.ScrolledText(bass_log_frame, wrap=tk.WORD, height=5, state='disabled', bg='black', fg='#FFC0CB'); self.bass_log_area.pack(fill=tk.BOTH, expand=True)
+        self.bass_log_area = scrolledtext.ScrolledText(bass_log_frame, wrap=tk.WORD, height=5, bg='black', fg='#FFC0CB'); self.bass_log_area.pack(fill=tk.BOTH, expand=True); self._make_log_read_only(self.bass_log_area)
         self.bass_log_area.tag_config('bass', foreground='#FFC0CB')
         
         melody2_log_frame = tk.LabelFrame(grid_frame, text="Melody 2 Log", bg='#2e2e2e', fg='white'); melody2_log_frame.grid(row=1, column=0, sticky='nsew', padx=2, pady=2)
-        self.melody2_log_area = scrolledtext.ScrolledText(melody2_log_frame, wrap=tk.WORD, height=5, state='disabled', bg='black', fg='#98FB98'); self.melody2_log_area.pack(fill=tk.BOTH, expand=True)
+        self.melody2_log_area = scrolledtext.ScrolledText(melody2_log_frame, wrap=tk.WORD, height=5, bg='black', fg='#98FB98'); self.melody2_log_area.pack(fill=tk.BOTH, expand=True); self._make_log_read_only(self.melody2_log_area)
         self.melody2_log_area.tag_config('melody2', foreground='#98FB98')
         
         chord_log_frame = tk.LabelFrame(grid_frame, text="Chord Log", bg='#2e2e2e', fg='white'); chord_log_frame.grid(row=1, column=1, sticky='nsew', padx=2, pady=2)
-        self.chord_log_area = scrolledtext.ScrolledText(chord_log_frame, wrap=tk.WORD, height=5, state='disabled', bg='black', fg='#ADD8E6'); self.chord_log_area.pack(fill=tk.BOTH, expand=True)
+        self.chord_log_area = scrolledtext.ScrolledText(chord_log_frame, wrap=tk.WORD, height=5, bg='black', fg='#ADD8E6'); self.chord_log_area.pack(fill=tk.BOTH, expand=True); self._make_log_read_only(self.chord_log_area)
         self.chord_log_area.tag_config('chords', foreground='#ADD8E6')
         
         drum_log_frame = tk.LabelFrame(grid_frame, text="Drum Events Log", bg='#2e2e2e', fg='white'); drum_log_frame.grid(row=2, column=0, sticky='nsew', padx=2, pady=2)
-        self.drum_log_area = scrolledtext.ScrolledText(drum_log_frame, wrap=tk.WORD, height=5, state='disabled', bg='black', fg='orange'); self.drum_log_area.pack(fill=tk.BOTH, expand=True)
+        self.drum_log_area = scrolledtext.ScrolledText(drum_log_frame, wrap=tk.WORD, height=5, bg='black', fg='orange'); self.drum_log_area.pack(fill=tk.BOTH, expand=True); self._make_log_read_only(self.drum_log_area)
         self.drum_log_area.tag_config('drums', foreground='orange')
+        self._log_widgets = {'main': self.main_log_area, 'melody1': self.melody1_log_area, 'melody2': self.melody2_log_area, 'bass': self.bass_log_area, 'chords': self.chord_log_area, 'drums': self.drum_log_area} # log_type -> widget, see _write_log_lines
         
         # Export and MIDI
         export_reload_frame = tk.LabelFrame(grid_frame, text="Export & MIDI", bg='#2e2e2e', fg='white'); export_reload_frame.grid(row=2, column=1, sticky='nsew', padx=2, pady=2)
@@ -478,6 +745,13 @@ class HarmonizerApp:
         self.reload_button = tk.Button(bottom_buttons_frame, text="Reload", command=self.reload_script, bg='#884d4d', fg='white'); self.reload_button.pack(side=tk.LEFT, padx=5)
 
     def _save_settings(self, *args):
+        """Schedules a settings save SETTINGS_SAVE_DELAY_MS from now, so a slider drag or a burst of keystrokes writes the file once."""
+        if self._save_after_id is not None: self.master.after_cancel(self._save_after_id)
+        self._save_after_id = self.master.after(self.SETTINGS_SAVE_DELAY_MS, self._flush_settings)
+
+    def _flush_settings(self, background=True):
+        """Snapshots the settings from the Tk variables and writes them, on a worker thread unless background is False."""
+        if self._save_after_id is not None: self.master.after_cancel(self._save_after_id); self._save_after_id = None
         settings = {
             "duration": self.entry_duration.get(), "bit_depth": self.bit_depth_var.get(), "auto_wave": self.auto_wave_var.get(),
             "m1_waveform": self.melody1_waveform_var.get(), "m2_waveform": self.melody2_waveform_var.get(),
@@ -491,14 +765,28 @@ class HarmonizerApp:
             "midi_m1": self.midi_m1_var.get(), "midi_m2": self.midi_m2_var.get(),
             "midi_chord": self.midi_chord_var.get(), "midi_bass": self.midi_bass_var.get(),
         }
+        self._settings_seq += 1
+        if background:
+            self._settings_writer = threading.Thread(target=self._write_settings, args=(settings, self._settings_seq), daemon=True); self._settings_writer.start()
+        else:
+            if self._settings_writer is not None: self._settings_writer.join()
+            self._write_settings(settings, self._settings_seq)
+
+    def _write_settings(self, settings, seq):
+        """Writes snapshot seq unless a newer one is already on disk. It goes to a '.part' file renamed into place, so a writer cut off at exit never leaves a truncated file."""
+        part_path = self.SETTINGS_FILE + ".part"
         try:
-            with open(self.SETTINGS_FILE, 'w') as f: json.dump(settings, f, indent=4)
+            with self._settings_write_lock:
+                if seq <= self._settings_written_seq: return
+                with open(part_path, 'wb') as f: f.write(orjson.dumps(settings, option=orjson.OPT_INDENT_2) if orjson else json.dumps(settings, indent=2, ensure_ascii=False).encode())
+                os.replace(part_path, self.SETTINGS_FILE)
+                self._settings_written_seq = seq
         except Exception as e: self.update_log(f"Error saving settings: {e}", 'main')
 
     def _load_settings(self):
         try:
             if os.path.exists(self.SETTINGS_FILE):
-                with open(self.SETTINGS_FILE, 'r') as f: settings = json.load(f)
+                with open(self.SETTINGS_FILE, 'rb') as f: settings = orjson.loads(f.read()) if orjson else json.load(f)
             else: settings = {}
 
             if self.ui_mode:
@@ -514,6 +802,7 @@ class HarmonizerApp:
                     var.set(loaded_forms.get(ft, (ft == "Standard")))
 
                 self.melody_volume_slider.set(settings.get("melody_vol", 70.0)); self.harmony_volume_slider.set(settings.get("harmony_vol", 70.0)); self.drum_volume_slider.set(settings.get("drum_vol", 70.0))
+                self._target_volumes = {'melody': self.melody_volume_slider.get() / 100.0, 'harmony': self.harmony_volume_slider.get() / 100.0, 'drums': self.drum_volume_slider.get() / 100.0}
                 
                 self.m1_pan_slider.set(settings.get("m1_pan", -20.0))
                 self.m2_pan_slider.set(settings.get("m2_pan", 20.0))
@@ -610,8 +899,8 @@ class HarmonizerApp:
     def open_debug_window(self):
         if self.debug_window is None or not self.debug_window.winfo_exists():
             self.debug_window = tk.Toplevel(self.master); self.debug_window.title("Debug Log"); self.debug_window.geometry("800x600")
-            self.debug_log_area = scrolledtext.ScrolledText(self.debug_window, wrap=tk.WORD, state='disabled', bg='black', fg='white')
-            self.debug_log_area.pack(fill=tk.BOTH, expand=True)
+            self.debug_log_area = scrolledtext.ScrolledText(self.debug_window, wrap=tk.WORD, bg='black', fg='white')
+            self.debug_log_area.pack(fill=tk.BOTH, expand=True); self._make_log_read_only(self.debug_log_area)
             self.debug_window.protocol("WM_DELETE_WINDOW", self.on_debug_close)
             self.update_log("Debug window opened.", 'debug', debug_only=True)
 
@@ -619,15 +908,16 @@ class HarmonizerApp:
         self.debug_window.destroy(); self.debug_window = None; self.debug_log_area = None
 
     def _get_related_key(self, base_key_name, relation='dominant'):
-        self.update_log(f"Getting related key for {base_key_name} with relation {relation}", 'debug', debug_only=True)
+        related_key = self.RELATED_KEYS.get((base_key_name, relation)) or self._compute_related_key(base_key_name, relation)
+        self.update_log(f"Related key ({relation}) of {base_key_name}: {related_key}", 'debug', debug_only=True)
+        return related_key
+
+    def _compute_related_key(self, base_key_name, relation):
         base_note, scale_kind = base_key_name.split(' ', 1); base_note_index = self.ALL_NOTES.index(base_note)
-        relations = {'dominant': 7, 'subdominant': 5, 'relative_major': 3, 'relative_minor': -3, 'chromatic_mediant_up': 4, 'chromatic_mediant_down': -4, 'tritone': 6}
-        if relation in relations:
-            related_index = (base_note_index + relations[relation]) % 12
+        if relation in self.RELATED_KEY_INTERVALS:
+            related_index = (base_note_index + self.RELATED_KEY_INTERVALS[relation]) % 12
             new_kind = 'Major' if 'Minor' in scale_kind else 'Minor' if 'relative' in relation else scale_kind
-            related_key = f"{self.ALL_NOTES[related_index]} {new_kind}"
-            self.update_log(f"  -> Found related key: {related_key}", 'debug', debug_only=True)
-            return related_key
+            return f"{self.ALL_NOTES[related_index]} {new_kind}"
         return f"{self.ALL_NOTES[(base_note_index + 7) % 12]} {scale_kind}"
 
     def _get_contrapuntal_motion(self, m1_direction):
@@ -635,13 +925,10 @@ class HarmonizerApp:
         return random.choices(['similar', 'contrary', 'oblique'], [0.4, 0.5, 0.1])[0]
 
     def _find_closest_note_name(self, freq):
-        min_dist, closest_name = float('inf'), "N/A"
-        for note_name, base_freq in self.NOTE_FREQUENCIES.items():
-            for octave in range(2, 7):
-                note_freq_in_octave = base_freq * (2**(octave-4))
-                if abs(freq - note_freq_in_octave) < min_dist:
-                    min_dist, closest_name = abs(freq - note_freq_in_octave), f"{note_name}{octave}"
-        return closest_name
+        if freq <= 0: return "N/A"
+        # Nearest equal-tempered MIDI note, limited to the C2-B6 range the log names cover
+        midi = min(95, max(36, int(round(69 + 12 * math.log2(freq / 440.0)))))
+        return f"{self.ALL_NOTES[midi % 12]}{midi // 12 - 1}"
     
     def _generate_urlinie(self, num_events, base_scale_len):
         """
@@ -691,16 +978,16 @@ class HarmonizerApp:
         # Max volume variation (related to dynamics setting)
         volume_variance = 0.1 + (dynamics_level * 0.2)
 
-        for event in events:
-            new_event = copy.deepcopy(event)
-            # Random timing offset
-            time_offset = random.uniform(-time_variance, time_variance)
-            new_event['start_time'] = max(0, new_event['start_time'] + time_offset)
-            
-            # Random volume offset
-            volume_offset = random.uniform(-volume_variance, volume_variance)
-            new_event['volume'] = max(0.1, min(1.0, new_event['volume'] + volume_offset))
-            
+        # Timing and volume offsets for the whole part come from two batched draws instead of two random.uniform calls per event
+        n = len(events)
+        start_times = np.fromiter((event['start_time'] for event in events), dtype=np.float64, count=n)
+        volumes = np.fromiter((event['volume'] for event in events), dtype=np.float64, count=n)
+        start_times = np.maximum(0, start_times + np.random.uniform(-time_variance, time_variance, n)).tolist()
+        volumes = np.clip(volumes + np.random.uniform(-volume_variance, volume_variance, n), 0.1, 1.0).tolist()
+
+        for event, start_time, volume in zip(events, start_times, volumes):
+            new_event = _copy_event(event)
+            new_event['start_time'], new_event['volume'] = start_time, volume
             humanized_events.append(new_event)
         return humanized_events
 
@@ -708,7 +995,7 @@ class HarmonizerApp:
         """Applies crescendos/decrescendos based on melodic contour."""
         if len(events) < 3: return events
         
-        contoured_events = copy.deepcopy(events)
+        contoured_events = [_copy_event(event) for event in events]
         for i in range(1, len(contoured_events) - 1):
             prev_note_idx = contoured_events[i-1]['scale_idx'][0] if contoured_events[i-1].get('scale_idx') else 0
             curr_note_idx = contoured_events[i]['scale_idx'][0] if contoured_events[i].get('scale_idx') else 0
@@ -738,86 +1025,129 @@ class HarmonizerApp:
             # ... (existing atonal logic) ...
             return max(0, min(scale_length - 1, next_note_index)), np.sign(next_note_index - current_note_index), 0
 
-        # Probabilistic melodic generation
-        weights = self.TWO_NOTE_TRANSITIONS.copy()
+        # Probabilistic melodic generation, compiled end to end
+        next_note_index, next_direction, consecutive_steps_new, chosen_interval = _melodic_step_kernel(
+            current_note_index, scale_length, self.TRANSITION_INTERVALS, self.TRANSITION_PROBS, tension,
+            -1 if target_note_idx is None else target_note_idx, self.CONTOUR_CODES.get(contour, 0), phrase_progress, int(last_direction), consecutive_steps)
         
-        # Apply tension: Higher tension favors larger/rarer intervals
-        for interval, prob in weights.items():
-            if abs(interval) > 2:
-                weights[interval] = prob * (1 + tension)
-            elif abs(interval) <= 1:
-                 weights[interval] = prob * (1 - tension * 0.5)
-
-        # Strong pull towards target notes (Schenkerian/structural)
-        if target_note_idx is not None:
-            direction_to_target = np.sign(target_note_idx - current_note_index)
-            if direction_to_target != 0:
-                if direction_to_target in weights:
-                    weights[direction_to_target] *= 5 # Strong bias
-                else: # Handle larger jumps to target
-                    weights[direction_to_target] = 0.1 
-
-        # Contour bias
-        contour_bias = 0
-        if contour == 'rising': contour_bias = 1
-        elif contour == 'falling': contour_bias = -1
-        elif contour == 'arch': contour_bias = 1 if phrase_progress < 0.5 else -1
-        elif contour == 'valley': contour_bias = -1 if phrase_progress < 0.5 else 1
-        
-        if contour_bias in weights:
-            weights[contour_bias] *= 1.5
-
-        # Avoid excessive repetition or zig-zag
-        if last_direction in weights:
-            weights[last_direction] *= 1.2 # Inertia
-        if -last_direction in weights and consecutive_steps > 3:
-            weights[-last_direction] *= 1.8 # Break long runs
-
-        # Choose next interval based on weighted probabilities
-        possible_intervals = list(weights.keys())
-        probabilities = np.array(list(weights.values()))
-        probabilities /= probabilities.sum() # Normalize
-        
-        chosen_interval = np.random.choice(possible_intervals, p=probabilities)
-        next_note_index = current_note_index + chosen_interval
-        
-        consecutive_steps_new = consecutive_steps + 1 if np.sign(chosen_interval) == last_direction else 1
-        next_direction = np.sign(chosen_interval)
-        
-        log_callback(f"    Probabilistic Choice: Interval={chosen_interval} -> New Index: {next_note_index}", 'debug', debug_only=True)
-        next_note_index = max(0, min(scale_length - 1, next_note_index))
+        log_callback(f"    Probabilistic Choice: Interval={chosen_interval} -> New Index: {current_note_index + chosen_interval}", 'debug', debug_only=True)
         return next_note_index, next_direction, consecutive_steps_new
 
+    def _get_scratch(self, num_samples):
+        """Returns a float64 work buffer of num_samples owned by the calling thread; its contents are garbage and it is only valid until that thread's next call."""
+        buf = getattr(self._scratch, 'buf', None)
+        if buf is None or buf.size < num_samples:
+            buf = self._scratch.buf = np.empty(num_samples)
+        return buf[:num_samples]
+
+    def _time_axis(self, duration, sample_rate):
+        """Returns the shared read-only sample-time axis np.linspace(0, duration, int(duration * sample_rate), False)."""
+        key = (duration, sample_rate)
+        t = self._t_cache.get(key)
+        if t is None:
+            if len(self._t_cache) >= self.T_CACHE_SIZE: self._t_cache.clear()
+            num_samples = int(duration * sample_rate)
+            # Render threads race here, so grow and slice a local reference; whichever thread publishes last, each one's own t is long enough
+            sample_index = self._sample_index
+            if sample_index.size < num_samples: sample_index = self._sample_index = np.arange(max(num_samples, 2 * sample_index.size), dtype=np.float64)
+            t = sample_index[:num_samples] * (duration / num_samples) if num_samples else np.zeros(0) # Same values as the linspace, without a fresh arange
+            t.setflags(write=False)
+            self._t_cache[key] = t
+        return t
+
     def _generate_rich_saw(self, freq, duration, sample_rate, num_harmonics=8, detune_factor=0.01):
-        t = np.linspace(0, duration, int(duration * sample_rate), False); wave = np.zeros_like(t)
+        t = self._time_axis(duration, sample_rate)
         lfo = 0.005 * np.sin(2 * np.pi * random.uniform(4, 7) * t)
-        for i in range(1, num_harmonics + 1):
-            detune = 1 + (random.random() - 0.5) * detune_factor; amplitude = 1.0 / (i**0.8)
-            wave += amplitude * signal.sawtooth(2 * np.pi * freq * i * detune * (1 + lfo) * t)
-        return wave
-        
-    def _generate_hollow_square(self, freq, duration, sample_rate):
-        num_samples = int(duration * sample_rate); t = np.linspace(0, duration, num_samples, False)
-        wave1, wave2 = signal.square(2 * np.pi * freq * t), signal.square(2 * np.pi * freq * t + np.pi / 2.5)
-        b, a = signal.butter(2, 2500 / (0.5 * sample_rate), btype='low'); filtered_wave = signal.lfilter(b, a, wave1 + wave2)
+        # Harmonics are stacked as rows and summed with one weighted reduction instead of a per-harmonic accumulate
+        i = np.arange(1, num_harmonics + 1)
+        detune = 1 + (np.array([random.random() for _ in i]) - 0.5) * detune_factor; amplitude = 1.0 / (i**0.8)
+        return amplitude @ _sawtooth_wave(2 * np.pi * freq * (i * detune)[:, np.newaxis] * ((1 + lfo) * t))
+        
+    def _generate_hollow_square(self, freqs, duration, sample_rate):
+        num_samples = int(duration * sample_rate); t = self._time_axis(duration, sample_rate)
+        # The filter and envelope are the same for every note, so the chord's oscillators are summed and filtered once
+        raw_wave = np.zeros(num_samples)
+        for freq in freqs: raw_wave += _square_wave(2 * np.pi * freq * t) + _square_wave(2 * np.pi * freq * t + np.pi / 2.5)
+        filtered_wave = signal.sosfilt(self._butter_sos(2, 2500, 'low', sample_rate), raw_wave)
         attack_samples, release_samples = min(int(0.02*sample_rate), num_samples//2), min(int(0.1*sample_rate), num_samples//2)
         sustain_samples = num_samples - attack_samples - release_samples
         env = np.concatenate([np.linspace(0, 1, attack_samples) if attack_samples > 0 else [], np.ones(sustain_samples) if sustain_samples > 0 else [], np.linspace(1, 0, release_samples) if release_samples > 0 else []])
         return filtered_wave * env
         
-    def _generate_violin(self, freq, duration, sample_rate):
+    def _generate_piano(self, freqs, duration, sample_rate):
+        num_samples = int(duration * sample_rate)
+        t_step = duration / num_samples # Sample spacing of np.linspace(0, duration, num_samples, False)
+        # One row per string; the soundboard and lowpass filters then run over all rows with one lfilter call each
+        strings = self._get_scratch(len(freqs) * num_samples).reshape(len(freqs), num_samples) # Consumed by the resonance filters below, which allocate their own outputs
+        attack_lengths, string_gains = [], []
+        for row, frequency in zip(strings, freqs):
+            piano_gain = 1.0 
+            num_partials = 16
+            log_freq = np.log2(max(frequency, 20) / 20)
+            # Inharmonicity: Upper partials are sharper than pure harmonics
+            inharmonicity_B = 0.0001 + 0.0004 * (1 - np.sin(np.pi * log_freq / 10))
+            decay_slow_base = 0.2 + (frequency / 2000.0) * 0.8 
+            decay_fast_base = 6.0 + (frequency / 2000.0) * 2.0
+            decay_freq_factor = 0.0005
+            amp_fast_component = 0.6 + 0.3 * (log_freq / 10)
+            # Beating effect from multiple strings
+            beating_factor = 1.0005 
+            ref_freq_piano = 440.0
+            boost_factor = (max(ref_freq_piano, frequency) / ref_freq_piano)**0.25
+            piano_gain *= boost_factor
+            
+            k = np.arange(1, num_partials + 1)
+            # Apply inharmonicity; partials above Nyquist are dropped
+            partial_freqs = k * frequency * np.sqrt(1 + inharmonicity_B * k**2)
+            audible = partial_freqs <= sample_rate / 2
+            k, partial_freqs = k[audible], partial_freqs[audible]
+            _decaying_partials_kernel(row, t_step, partial_freqs,
+                                   decay_fast_base + partial_freqs * decay_freq_factor,
+                                   decay_slow_base + partial_freqs * decay_freq_factor * 0.5,
+                                   np.exp(-0.0008 * partial_freqs) / k, amp_fast_component, beating_factor)
+
+            attack_time = 0.002 + 0.02 * (1 - (log_freq / 10))
+            attack_lengths.append(min(int(attack_time * sample_rate), num_samples)); string_gains.append(piano_gain)
+        
+        soundboard_resonances = [(90, 20), (160, 15), (300, 10)]
+        soundboard_filtered = np.zeros_like(strings)
+        for res_freq, Q in soundboard_resonances:
+            b_res, a_res = signal.iirpeak(res_freq, Q, fs=sample_rate)
+            soundboard_filtered += signal.lfilter(b_res, a_res, strings, axis=1)
+        
+        audio_data = signal.sosfilt(self._butter_sos(2, 6000, 'low', sample_rate), soundboard_filtered, axis=1)
+        
+        # The attack depends on pitch, so it is applied per string after the shared filters
+        for row, attack_samples in zip(audio_data, attack_lengths):
+            if attack_samples > 0:
+                attack_env = np.linspace(0, 1, attack_samples)**1.5
+                row[:attack_samples] *= attack_env
+
+        release_time = 0.08
+        release_samples = min(int(release_time * sample_rate), num_samples)
+        if release_samples > 0:
+            release_env = np.linspace(1, 0, release_samples)**2
+            audio_data[:, -release_samples:] *= release_env
+
+        audio_data *= np.array(string_gains)[:, np.newaxis]
+        return audio_data.sum(axis=0)
+
+    def _generate_violin(self, freqs, duration, sample_rate):
         num_samples = int(duration * sample_rate)
-        t = np.linspace(0, duration, num_samples, False)
+        t = self._time_axis(duration, sample_rate)
         
-        vibrato_rate = random.uniform(5.5, 6.5)
-        vibrato_depth = 0.012
-        phase_increment = (2 * np.pi * (freq/2) / sample_rate) * (1 + vibrato_depth * np.sin(2 * np.pi * vibrato_rate * t))
-        phase = np.cumsum(phase_increment)
+        # Each string gets its own vibrato and bow noise; the body filters below are linear and shared, so they run once on the summed strings
+        wave = np.zeros(num_samples)
+        for freq in freqs:
+            vibrato_rate = random.uniform(5.5, 6.5)
+            vibrato_depth = 0.012
+            phase_increment = (2 * np.pi * (freq/2) / sample_rate) * (1 + vibrato_depth * np.sin(2 * np.pi * vibrato_rate * t))
+            phase = np.cumsum(phase_increment)
 
-        saw_wave = signal.sawtooth(phase)
-        triangle_wave = signal.sawtooth(phase * 1.002, width=0.5) # Slight detune
-        bow_noise = np.random.normal(0, 0.03, num_samples)
-        wave = (saw_wave * 0.65) + (triangle_wave * 0.35) + bow_noise
+            saw_wave = _sawtooth_wave(phase)
+            triangle_wave = _triangle_wave(phase * 1.002) # Slight detune
+            bow_noise = np.random.normal(0, 0.03, num_samples)
+            wave += (saw_wave * 0.65) + (triangle_wave * 0.35) + bow_noise
 
         formant_intensity = 1.0 + 0.1 * np.sin(2 * np.pi * 1.5 * t)
         
@@ -829,8 +1159,7 @@ class HarmonizerApp:
         
         if formants: body_filtered_wave /= len(formants)
 
-        b_lp, a_lp = signal.butter(2, 6000 / (0.5 * sample_rate), btype='low')
-        final_wave = signal.lfilter(b_lp, a_lp, body_filtered_wave)
+        final_wave = signal.sosfilt(self._butter_sos(2, 6000, 'low', sample_rate), body_filtered_wave)
 
         attack_time = 0.08; release_time = 0.15
         attack_samples = min(int(attack_time * sample_rate), num_samples//2)
@@ -848,20 +1177,23 @@ class HarmonizerApp:
         ])
         return final_wave * env
 
-    def _generate_cello(self, freq, duration, sample_rate):
+    def _generate_cello(self, freqs, duration, sample_rate):
         num_samples = int(duration * sample_rate)
-        t = np.linspace(0, duration, num_samples, False)
-        base_freq = freq / 2
-        vibrato_rate = random.uniform(4.8, 5.5)
-        vibrato_depth = 0.009
-        phase_increment = (2 * np.pi * base_freq / sample_rate) * (1 + vibrato_depth * np.sin(2 * np.pi * vibrato_rate * t))
-        phase = np.cumsum(phase_increment)
-
-        saw_wave = signal.sawtooth(phase)
-        triangle_wave = signal.sawtooth(phase * 1.003, width=0.5) 
-        sine_wave = np.sin(phase)
-        bow_noise = np.random.normal(0, 0.025, num_samples) 
-        wave = (saw_wave * 0.5) + (triangle_wave * 0.4) + (sine_wave * 0.1) + bow_noise
+        t = self._time_axis(duration, sample_rate)
+        # As with the violin, strings are excited separately and share one pass through the body filters
+        wave = np.zeros(num_samples)
+        for freq in freqs:
+            base_freq = freq / 2
+            vibrato_rate = random.uniform(4.8, 5.5)
+            vibrato_depth = 0.009
+            phase_increment = (2 * np.pi * base_freq / sample_rate) * (1 + vibrato_depth * np.sin(2 * np.pi * vibrato_rate * t))
+            phase = np.cumsum(phase_increment)
+
+            saw_wave = _sawtooth_wave(phase)
+            triangle_wave = _triangle_wave(phase * 1.003) 
+            sine_wave = np.sin(phase)
+            bow_noise = np.random.normal(0, 0.025, num_samples) 
+            wave += (saw_wave * 0.5) + (triangle_wave * 0.4) + (sine_wave * 0.1) + bow_noise
 
         formant_intensity_envelope = 1.0 + 0.05 * np.sin(2 * np.pi * 1.2 * t)
         formants = [ (250, 9), (500, 11), (1500, 8), (3500, 7) ]
@@ -874,8 +1206,7 @@ class HarmonizerApp:
         
         if formants: body_filtered_wave /= len(formants)
 
-        b_lp, a_lp = signal.butter(2, 3800 / (0.5 * sample_rate), btype='low') 
-        final_wave = signal.lfilter(b_lp, a_lp, body_filtered_wave)
+        final_wave = signal.sosfilt(self._butter_sos(2, 3800, 'low', sample_rate), body_filtered_wave)
 
         attack_time, release_time = 0.1, 0.3
         attack_samples = min(int(attack_time * sample_rate), num_samples // 2)
@@ -894,23 +1225,21 @@ class HarmonizerApp:
         ])
         return final_wave * env
 
-    def _generate_guitar(self, freq, duration, sample_rate):
+    def _generate_guitar(self, freqs, duration, sample_rate):
         num_samples = int(duration * sample_rate)
-        t = np.linspace(0, duration, num_samples, False)
-        wave = np.zeros(num_samples)
+        wave = self._get_scratch(num_samples) # Only read by the lowpass below
         num_harmonics = 20; inharmonicity_B = 0.0001
         pluck_pos = 1/3.0 
-        for k in range(1, num_harmonics + 1):
-            pluck_factor = np.sin(k * np.pi * pluck_pos)
-            if abs(pluck_factor) < 1e-6: continue
-            partial_freq = k * freq/2 * np.sqrt(1 + inharmonicity_B * k**2)
-            if partial_freq > sample_rate / 2: continue
-            decay_rate = 2.0 + k * 0.8 + (k**2) * 0.05
-            envelope = np.exp(-decay_rate * t)
-            amplitude = pluck_factor / (k**1.1)
-            wave += amplitude * np.sin(2 * np.pi * partial_freq * t) * envelope
-        b, a = signal.butter(2, 5000 / (0.5 * sample_rate), btype='low')
-        filtered_wave = signal.lfilter(b, a, wave)
+        # Harmonics of every string as one (string, harmonic) grid summed by a single kernel call; nodes of the pluck position and partials above Nyquist are dropped
+        k = np.arange(1, num_harmonics + 1)
+        partial_freq = k * np.asarray(freqs, dtype=np.float64)[:, np.newaxis]/2 * np.sqrt(1 + inharmonicity_B * k**2)
+        k = np.broadcast_to(k, partial_freq.shape)
+        pluck_factor = np.sin(k * np.pi * pluck_pos)
+        keep = (np.abs(pluck_factor) >= 1e-6) & (partial_freq <= sample_rate / 2)
+        k, pluck_factor, partial_freq = k[keep], pluck_factor[keep], partial_freq[keep]
+        decay_rate = 2.0 + k * 0.8 + (k**2) * 0.05
+        _decaying_partials_kernel(wave, duration / max(num_samples, 1), partial_freq, decay_rate, decay_rate, pluck_factor / (k**1.1), 1.0, 1.0)
+        filtered_wave = signal.sosfilt(self._butter_sos(2, 5000, 'low', sample_rate), wave)
         attack_time = 0.005
         attack_samples = int(attack_time * sample_rate)
         if attack_samples > 0 and num_samples > attack_samples:
@@ -918,7 +1247,19 @@ class HarmonizerApp:
         return filtered_wave
 
     def _apply_adsr_envelope(self, audio_data, attack_time, decay_time, sustain_level, release_time, sample_rate):
-        num_samples = len(audio_data)
+        return audio_data * self._adsr_envelope(len(audio_data), attack_time, decay_time, sustain_level, release_time, sample_rate, audio_data.dtype)
+
+    def _cache_envelope(self, key, envelope):
+        if len(self._env_cache) >= self.ENV_CACHE_SIZE: self._env_cache.clear()
+        envelope.setflags(write=False)
+        self._env_cache[key] = envelope
+        return envelope
+
+    def _adsr_envelope(self, num_samples, attack_time, decay_time, sustain_level, release_time, sample_rate, dtype):
+        """Returns the shared read-only ADSR envelope for a tone of num_samples; notes of equal length and shape reuse one array."""
+        key = ('adsr', num_samples, attack_time, decay_time, sustain_level, release_time, sample_rate, np.dtype(dtype))
+        envelope = self._env_cache.get(key)
+        if envelope is not None: return envelope
         attack_samples = int(attack_time * sample_rate)
         decay_samples = int(decay_time * sample_rate)
         release_samples = int(release_time * sample_rate)
@@ -930,7 +1271,7 @@ class HarmonizerApp:
             sustain_samples = 0
             decay_samples = max(0, decay_samples + sustain_samples)
         
-        envelope = np.zeros(num_samples)
+        envelope = np.zeros(num_samples, dtype=dtype)
         
         if attack_samples > 0:
             envelope[:attack_samples] = np.linspace(0, 1, attack_samples)
@@ -944,139 +1285,145 @@ class HarmonizerApp:
         if release_samples > 0:
             envelope[-release_samples:] = np.linspace(sustain_level, 0, release_samples)
 
-        return audio_data * envelope
+        return self._cache_envelope(key, envelope)
+
+    def _decay_envelope(self, duration, rate, sample_rate):
+        """Returns the shared read-only exponential decay np.exp(-rate * t) over _time_axis(duration, sample_rate)."""
+        key = ('exp', duration, rate, sample_rate)
+        envelope = self._env_cache.get(key)
+        if envelope is None: envelope = self._cache_envelope(key, np.exp(-rate * self._time_axis(duration, sample_rate)))
+        return envelope
+
+    def _butter_sos(self, order, cutoff_hz, btype, sample_rate):
+        """Returns Butterworth second-order sections, designing each filter only once."""
+        key = (order, cutoff_hz, btype, sample_rate)
+        sos = self._sos_cache.get(key)
+        if sos is None: sos = self._sos_cache[key] = signal.butter(order, cutoff_hz, btype=btype, output='sos', fs=sample_rate)
+        return sos
+
+    def _white_noise(self, num_samples):
+        """Returns a read-only uniform [-1, 1) white noise slice from a random offset in the shared noise pool."""
+        pool = self._noise_pool
+        if num_samples >= len(pool): return np.random.uniform(-1, 1, num_samples)
+        start = random.randrange(len(pool) - num_samples)
+        return pool[start:start + num_samples]
 
     def _generate_tone(self, duration_sec, sample_rate, freqs, waveform_type):
+        """Returns a read-only tone, synthesizing each (freqs, waveform, duration, sample_rate) combination only once per TONE_CACHE_SIZE recent tones."""
+        key = self._tone_key(duration_sec, sample_rate, freqs, waveform_type)
+        with self._tone_cache_lock:
+            tone = self._tone_cache.get(key)
+            if tone is not None:
+                self._tone_cache.move_to_end(key); return tone
+        tone = self._synthesize_tone(duration_sec, sample_rate, freqs, waveform_type)
+        tone.setflags(write=False)
+        with self._tone_cache_lock:
+            self._tone_cache[key] = tone
+            if len(self._tone_cache) > self.TONE_CACHE_SIZE: self._tone_cache.popitem(last=False)
+        return tone
+
+    def _tone_template(self, key, duration_sec, synth_rate, freqs, waveform_type, sample_rate):
+        """Returns (tone, gain) for the tone cached under key: a read-only float32 copy at sample_rate, upsampled from synth_rate if that is lower, and
+        its normalization gain. Repeated notes across renders skip the conversion, resampling and level scan; the mix kernel adds the edge fades."""
+        template_key = (key, sample_rate)
+        with self._tone_cache_lock:
+            template = self._tone_templates.get(template_key)
+            if template is not None:
+                self._tone_templates.move_to_end(template_key); return template
+        tone = self._generate_tone(duration_sec, synth_rate, freqs, waveform_type)
+        if synth_rate != sample_rate and tone.size:
+            rate_gcd = math.gcd(int(sample_rate), int(synth_rate))
+            tone = signal.resample_poly(tone, int(sample_rate) // rate_gcd, int(synth_rate) // rate_gcd)
+        tone = tone.astype(np.float32, copy=False)
+        tone.setflags(write=False)
+        template = (tone, self._normalization_gain(tone))
+        with self._tone_cache_lock:
+            self._tone_templates[template_key] = template
+            if len(self._tone_templates) > self.TONE_CACHE_SIZE: self._tone_templates.popitem(last=False)
+        return template
+
+    def _tone_key(self, duration_sec, sample_rate, freqs, waveform_type):
+        """Cache key under which _generate_tone treats tones as identical: sorted freqs to 3 decimals, duration to 4."""
+        if not isinstance(freqs, list): freqs = [freqs]
+        return (tuple(sorted(round(f, 3) for f in freqs)), waveform_type, round(duration_sec, 4), sample_rate)
+
+    def _synthesize_tone(self, duration_sec, sample_rate, freqs, waveform_type):
         self.update_log(f"Generating tone: {waveform_type} at {freqs} Hz for {duration_sec}s", 'debug', debug_only=True)
         if not isinstance(freqs, list): freqs = [freqs]
         num_samples = int(duration_sec * sample_rate)
-        if num_samples <= 0: return np.zeros(0)
-        t = np.linspace(0, duration_sec, num_samples, False)
+        if num_samples <= 0: return np.zeros(0, dtype=np.float32)
+        t_step = duration_sec / num_samples # Sample spacing of np.linspace(0, duration_sec, num_samples, False)
         
-        combined_audio = np.zeros(num_samples)
+        # Tones are stored and mixed as float32; the kernels keep phase arithmetic in float64 and only the samples are narrowed
+        combined_audio = np.zeros(num_samples, dtype=np.float32)
         if not freqs: return combined_audio
 
-        for frequency in freqs:
-            audio_data = np.zeros(num_samples)
-            
-            is_basic_waveform = False
-            if waveform_type == 'Square': 
-                audio_data = np.sign(np.sin(frequency * t * 2 * np.pi))
-                is_basic_waveform = True
-            elif waveform_type == 'Sawtooth': 
-                audio_data = signal.sawtooth(2 * np.pi * frequency * t)
-                is_basic_waveform = True
-            elif waveform_type == 'Triangle': 
-                audio_data = signal.sawtooth(2 * np.pi * frequency * t, width=0.5)
-                is_basic_waveform = True
-            
-            elif waveform_type == 'Piano':
-                piano_gain = 1.0 
-                num_partials = 16
-                log_freq = np.log2(max(frequency, 20) / 20)
-                # Inharmonicity: Upper partials are sharper than pure harmonics
-                inharmonicity_B = 0.0001 + 0.0004 * (1 - np.sin(np.pi * log_freq / 10))
-                decay_slow_base = 0.2 + (frequency / 2000.0) * 0.8 
-                decay_fast_base = 6.0 + (frequency / 2000.0) * 2.0
-                decay_freq_factor = 0.0005
-                amp_fast_component = 0.6 + 0.3 * (log_freq / 10)
-                # Beating effect from multiple strings
-                beating_factor = 1.0005 
-                ref_freq_piano = 440.0
-                boost_factor = (max(ref_freq_piano, frequency) / ref_freq_piano)**0.25
-                piano_gain *= boost_factor
-                
-                for k in range(1, num_partials + 1):
-                    # Apply inharmonicity
-                    partial_freq = k * frequency * np.sqrt(1 + inharmonicity_B * k**2)
-                    if partial_freq > sample_rate / 2: continue
-                    decay_fast = decay_fast_base + partial_freq * decay_freq_factor
-                    decay_slow = decay_slow_base + partial_freq * decay_freq_factor * 0.5
-                    env_fast = np.exp(-decay_fast * t); wave_fast = np.sin(2 * np.pi * partial_freq * t)
-                    # Create two slightly detuned waves for beating/chorus effect
-                    env_slow = np.exp(-decay_slow * t); wave_slow = np.sin(2 * np.pi * partial_freq * beating_factor * t)
-                    partial_amplitude = np.exp(-0.0008 * partial_freq) / k
-                    combined_partial = partial_amplitude * (amp_fast_component * wave_fast * env_fast + (1 - amp_fast_component) * wave_slow * env_slow)
-                    audio_data += combined_partial
-                
-                soundboard_resonances = [(90, 20), (160, 15), (300, 10)]
-                soundboard_filtered = np.zeros_like(audio_data)
-                for res_freq, Q in soundboard_resonances:
-                    b_res, a_res = signal.iirpeak(res_freq, Q, fs=sample_rate)
-                    soundboard_filtered += signal.lfilter(b_res, a_res, audio_data)
-                
-                b_lp, a_lp = signal.butter(2, 6000, 'low', fs=sample_rate)
-                audio_data = signal.lfilter(b_lp, a_lp, soundboard_filtered)
-                
-                attack_time = 0.002 + 0.02 * (1 - (log_freq / 10))
-                attack_samples = min(int(attack_time * sample_rate), num_samples)
-                if attack_samples > 0:
-                    attack_env = np.linspace(0, 1, attack_samples)**1.5
-                    audio_data[:attack_samples] *= attack_env
-
-                release_time = 0.08
-                release_samples = min(int(release_time * sample_rate), num_samples)
-                if release_samples > 0:
-                    release_env = np.linspace(1, 0, release_samples)**2
-                    audio_data[-release_samples:] *= release_env
-
-                audio_data *= piano_gain
-
-            elif waveform_type == 'Violin': audio_data = self._generate_violin(frequency, duration_sec, sample_rate)
-            elif waveform_type == 'Cello': audio_data = self._generate_cello(frequency, duration_sec, sample_rate)
-            elif waveform_type == 'Guitar': audio_data = self._generate_guitar(frequency, duration_sec, sample_rate)
-            elif waveform_type == 'Rich Saw': audio_data = self._generate_rich_saw(frequency, duration_sec, sample_rate)
-            elif waveform_type == 'Hollow Square': audio_data = self._generate_hollow_square(frequency, duration_sec, sample_rate)
-            else: 
-                audio_data = np.sin(frequency * t * 2 * np.pi)
-                is_basic_waveform = True
-
-            if is_basic_waveform:
-                attack, decay, sustain, release = 0.02, 0.1, 0.7, 0.2
-                if release > duration_sec:
-                    release = duration_sec * 0.5; attack = duration_sec * 0.1; decay = duration_sec * 0.1
-                audio_data = self._apply_adsr_envelope(audio_data, attack, decay, sustain, release, sample_rate)
-            
-            combined_audio += audio_data
-
-        return combined_audio if freqs else np.zeros(num_samples)
+        if waveform_type not in self.INSTRUMENT_WAVEFORMS:
+            # Basic oscillators share one ADSR, so the whole chord is summed in one kernel pass and enveloped once
+            _basic_waves_kernel(combined_audio, np.asarray(freqs, dtype=np.float64), t_step, self.BASIC_WAVE_SHAPES.get(waveform_type, 0))
+            attack, decay, sustain, release = 0.02, 0.1, 0.7, 0.2
+            if release > duration_sec:
+                release = duration_sec * 0.5; attack = duration_sec * 0.1; decay = duration_sec * 0.1
+            return self._apply_adsr_envelope(combined_audio, attack, decay, sustain, release, sample_rate)
+
+        # Each instrument voices the whole chord at once, so filters shared by its notes run once per chord instead of once per note
+        if waveform_type == 'Piano': combined_audio += self._generate_piano(freqs, duration_sec, sample_rate)
+        elif waveform_type == 'Violin': combined_audio += self._generate_violin(freqs, duration_sec, sample_rate)
+        elif waveform_type == 'Cello': combined_audio += self._generate_cello(freqs, duration_sec, sample_rate)
+        elif waveform_type == 'Guitar': combined_audio += self._generate_guitar(freqs, duration_sec, sample_rate)
+        elif waveform_type == 'Hollow Square': combined_audio += self._generate_hollow_square(freqs, duration_sec, sample_rate)
+        elif waveform_type == 'Rich Saw':
+            for frequency in freqs: combined_audio += self._generate_rich_saw(frequency, duration_sec, sample_rate)
+
+        return combined_audio
 
     def _generate_kick(self, duration_sec, sample_rate):
-        num_samples = int(duration_sec * sample_rate); t = np.linspace(0, duration_sec, num_samples, False)
+        num_samples = int(duration_sec * sample_rate)
         pitch_env = np.geomspace(120, 40, num_samples); thump = np.sin(2 * np.pi * np.cumsum(pitch_env) / sample_rate)
-        thump_env = np.exp(-25.0 * t)
-        click_noise = np.random.uniform(-1, 1, num_samples)
-        b, a = signal.butter(2, 2000/(0.5*sample_rate), btype='high'); filtered_click = signal.lfilter(b, a, click_noise)
-        click_env = np.exp(-200.0 * t)
+        thump_env = self._decay_envelope(duration_sec, 25.0, sample_rate)
+        click_noise = self._white_noise(num_samples)
+        filtered_click = signal.sosfilt(self._butter_sos(2, 2000, 'high', sample_rate), click_noise)
+        click_env = self._decay_envelope(duration_sec, 200.0, sample_rate)
         return (thump * thump_env * 0.9) + (filtered_click * click_env * 0.1)
 
     def _generate_snare(self, duration_sec, sample_rate):
-        num_samples = int(duration_sec * sample_rate); t = np.linspace(0, duration_sec, num_samples, False)
-        body_tone = np.sin(2 * np.pi * 180 * t) + np.sin(2 * np.pi * 280 * t); body_env = np.exp(-30.0 * t)
-        snap_noise = np.random.uniform(-1, 1, num_samples)
-        b, a = signal.butter(4, 1500/(0.5*sample_rate), btype='high'); filtered_snap = signal.lfilter(b, a, snap_noise)
-        snap_env = np.exp(-40.0 * t)
+        num_samples = int(duration_sec * sample_rate); t = self._time_axis(duration_sec, sample_rate)
+        body_tone = np.sin(2 * np.pi * 180 * t) + np.sin(2 * np.pi * 280 * t); body_env = self._decay_envelope(duration_sec, 30.0, sample_rate)
+        snap_noise = self._white_noise(num_samples)
+        filtered_snap = signal.sosfilt(self._butter_sos(4, 1500, 'high', sample_rate), snap_noise)
+        snap_env = self._decay_envelope(duration_sec, 40.0, sample_rate)
         return (body_tone * body_env * 0.3) + (filtered_snap * snap_env * 0.7)
 
     def _generate_hi_hat(self, duration_sec, sample_rate, is_open=False):
         num_samples = int(duration_sec * sample_rate)
-        raw_sound = sum(signal.square(2 * np.pi * freq * np.linspace(0, duration_sec, num_samples, False)) for freq in [3000, 4700, 6800, 8500, 9800])
-        b, a = signal.butter(6, 6000/(0.5*sample_rate), btype='high'); filtered_sound = signal.lfilter(b, a, raw_sound)
-        env = np.exp(-(15.0 if is_open else 80.0) * np.linspace(0, duration_sec, num_samples, False))
+        t = self._time_axis(duration_sec, sample_rate)
+        raw_sound = sum(_square_wave(2 * np.pi * freq * t) for freq in [3000, 4700, 6800, 8500, 9800])
+        filtered_sound = signal.sosfilt(self._butter_sos(6, 6000, 'high', sample_rate), raw_sound)
+        env = self._decay_envelope(duration_sec, 15.0 if is_open else 80.0, sample_rate)
         return filtered_sound * env
 
     def _generate_percussion_sound(self, drum_type, duration_sec, sample_rate):
+        """Returns a read-only drum hit, synthesizing each (drum_type, duration, sample_rate) patch only once."""
+        key = (drum_type, round(duration_sec, 4), sample_rate)
+        sound = self._drum_cache.get(key)
+        if sound is None:
+            if len(self._drum_cache) >= self.DRUM_CACHE_SIZE: self._drum_cache.clear()
+            sound = self._synthesize_percussion_sound(drum_type, key[1], sample_rate).astype(np.float32, copy=False) # Stored and mixed as float32, like tones
+            sound.setflags(write=False)
+            self._drum_cache[key] = sound
+        return sound
+
+    def _synthesize_percussion_sound(self, drum_type, duration_sec, sample_rate):
         self.update_log(f"Generating percussion: {drum_type} for {duration_sec}s", 'debug', debug_only=True)
         if duration_sec <= 0: return np.zeros(0)
         if drum_type == 'kick': return self._generate_kick(duration_sec, sample_rate)
         elif drum_type == 'snare': return self._generate_snare(duration_sec, sample_rate)
         elif drum_type == 'hihat_closed': return self._generate_hi_hat(duration_sec, sample_rate, is_open=False)
         elif drum_type == 'hihat_open': return self._generate_hi_hat(duration_sec, sample_rate, is_open=True)
-        elif drum_type == 'tom': return self._generate_tone(duration_sec, sample_rate, [120], 'Sine') * np.exp(-20.0 * np.linspace(0, duration_sec, int(duration_sec * sample_rate), False))
+        elif drum_type == 'tom': return self._generate_tone(duration_sec, sample_rate, [120], 'Sine') * self._decay_envelope(duration_sec, 20.0, sample_rate)
         elif drum_type == 'crash':
-            noise = np.random.uniform(-1, 1, int(duration_sec * sample_rate))
-            b, a = signal.butter(8, 4000/(0.5*sample_rate), btype='high')
-            return signal.lfilter(b, a, noise) * np.exp(-4.0 * np.linspace(0, duration_sec, int(duration_sec * sample_rate), False))
+            noise = self._white_noise(int(duration_sec * sample_rate))
+            return signal.sosfilt(self._butter_sos(8, 4000, 'high', sample_rate), noise) * self._decay_envelope(duration_sec, 4.0, sample_rate)
         return np.zeros(int(duration_sec*sample_rate))
 
     def _generate_dynamic_drum_rhythm(self, section_name, section_duration, drum_bpm, song_style, tension):
@@ -1088,17 +1435,22 @@ class HarmonizerApp:
 
         num_measures = int(section_duration / (beat_duration * 4))
         self.update_log(f"  -> Measures: {num_measures}, Beat Duration: {beat_duration:.3f}s", 'debug', debug_only=True)
+        # Fill and crash decisions for every measure come from one batched draw compared against their probabilities
+        measures, rolls = np.arange(num_measures), np.random.random((2, num_measures))
+        fill_measures = (((measures + 1) % 4 == 0) & (rolls[0] < 0.15 + tension * 0.3)).tolist()
+        crash_measures = ((measures % 4 == 0) & (tension > 0.7) & (rolls[1] < 0.6)).tolist()
         for measure in range(num_measures):
-            is_fill_measure = (measure + 1) % 4 == 0 and random.random() < (0.15 + tension * 0.3)
+            is_fill_measure = fill_measures[measure]
             pattern = self.DRUM_PATTERNS[song_style]['fill' if is_fill_measure else 'main']
             self.update_log(f"  Measure {measure+1}: Using {'fill' if is_fill_measure else 'main'} pattern.", 'debug', debug_only=True)
             measure_start_time = measure * beat_duration * 4
-            if measure % 4 == 0 and tension > 0.7 and random.random() < 0.6:
+            if crash_measures[measure]:
                 drum_track_data.append({'start_time': measure_start_time, 'duration': beat_duration * 2, 'drum_type': 'crash', 'volume': 0.8})
                 self.update_log(f"  -> Added tension crash at measure start.", 'debug', debug_only=True)
-            for beat, drum_type in pattern:
+            jitters = np.random.uniform(-humanization_factor, humanization_factor, len(pattern)).tolist() # One draw per measure
+            for (beat, drum_type), jitter in zip(pattern, jitters):
                 swing_delay = (beat_duration * swing_factor) if beat % 1.0 in [0.5, 0.75] else 0
-                hit_time = max(0, measure_start_time + (beat * beat_duration) + swing_delay + random.uniform(-humanization_factor, humanization_factor))
+                hit_time = max(0, measure_start_time + (beat * beat_duration) + swing_delay + jitter)
                 
                 base_volume = 1.0 if beat % 4 == 0 else 0.85 if beat % 4 == 2 else 0.7
                 final_volume = base_volume
@@ -1130,14 +1482,17 @@ class HarmonizerApp:
         else:
             motif = self.RHYTHMIC_MOTIFS[chosen_motif_name]
 
+        # Each pass through the motif covers at least its own length, which bounds how many rest rolls can be needed
+        rest_rolls = np.random.random(int(total_beats / max(sum(motif), 0.5)) + 2).tolist(); motif_pass = 0
         while beats_generated < total_beats:
             for duration in motif:
                 if beats_generated + duration > total_beats:
                     if total_beats - beats_generated > 0: sequence.append(total_beats - beats_generated)
                     beats_generated = total_beats; break
                 sequence.append(duration); beats_generated += duration
-            if beats_generated < total_beats and random.random() < 0.3 and beats_generated + 0.5 <= total_beats:
+            if beats_generated < total_beats and rest_rolls[motif_pass] < 0.3 and beats_generated + 0.5 <= total_beats:
                 sequence.append(-0.5); beats_generated += 0.5
+            motif_pass += 1
         self.update_log(f"  -> Generated sequence: {sequence}", 'debug', debug_only=True)
         return [sequence], chosen_motif_name
 
@@ -1159,17 +1514,8 @@ class HarmonizerApp:
         return events, current_time
 
     def _build_harmony_figure(self, base_note_idx, scale_len, base_scale_len, dissonance_level, current_chord_indices):
-        num_notes = random.choices([1, 2, 3], weights=[0.7, 0.25, 0.05])[0]
-        if num_notes == 1: return [base_note_idx]
-        notes = [base_note_idx]
-        octave_offset = (base_note_idx // base_scale_len) * base_scale_len
-        chord_tones_in_octave = [idx + octave_offset for idx in current_chord_indices]
-        for _ in range(num_notes - 1):
-            new_note = random.choice(chord_tones_in_octave)
-            if random.random() < 0.3: new_note += random.choice([-1, 1]) * base_scale_len
-            new_note = max(0, min(scale_len - 1, new_note))
-            if new_note not in notes: notes.append(new_note)
-        return sorted(list(set(notes)))
+        figure = _harmony_figure_kernel(int(base_note_idx), scale_len, base_scale_len, np.asarray(current_chord_indices, dtype=np.int32))
+        return figure.tolist()
 
     def _get_waveform(self, var):
         val = var.get()
@@ -1238,7 +1584,7 @@ class HarmonizerApp:
         events, current_idx, current_time = [], start_idx, start_time
         transformation = random.choice(['none', 'inversion', 'augmentation', 'diminution', 'retrograde', 'sequence_up', 'sequence_down', 'fragmentation'])
         self.update_log(f"Applying thematic seed with transformation: {transformation}", "debug", debug_only=True)
-        seed_to_use = copy.deepcopy(self.thematic_seed)
+        seed_to_use = list(self.thematic_seed) # Seed notes are only read, so reordering and slicing a shallow copy is enough
         if transformation == 'retrograde': seed_to_use.reverse()
         elif transformation == 'sequence_up': current_idx += 2
         elif transformation == 'sequence_down': current_idx -= 2
@@ -1363,7 +1709,7 @@ class HarmonizerApp:
                     octave_multiple = round((main_note_idx - arp_note_base_idx) / 7)
                     arp_note_idx = max(0, min(len(scale_notes) - 1, arp_note_base_idx + (octave_multiple * 7)))
 
-                    new_event = copy.deepcopy(event)
+                    new_event = _copy_event(event)
                     new_event.update({'start_time': time_cursor, 'duration': note_dur, 'scale_idx': [arp_note_idx], 'freqs': [scale_notes[arp_note_idx]]})
                     ornamented_events.append(new_event)
                     time_cursor += note_dur
@@ -1372,7 +1718,7 @@ class HarmonizerApp:
             elif ornament_type == 'acciaccatura' and main_note_idx > 0 and event['duration'] > 0.05:
                 self.update_log(f"  -> Adding acciaccatura at {event['start_time']:.2f}s", 'debug', debug_only=True)
                 event['duration'] -= 0.05; event['start_time'] += 0.05
-                grace_event = copy.deepcopy(event)
+                grace_event = _copy_event(event)
                 grace_event.update({'start_time': event['start_time'] - 0.05, 'duration': 0.05, 'scale_idx': [main_note_idx - 1], 'freqs': [scale_notes[main_note_idx - 1]]})
                 ornamented_events.insert(-1, grace_event); ornament_times.append(grace_event['start_time'])
             
@@ -1381,8 +1727,8 @@ class HarmonizerApp:
                 if event['duration'] > ornament_dur * 2:
                     self.update_log(f"  -> Adding mordent at {event['start_time']:.2f}s", 'debug', debug_only=True)
                     event['duration'] -= ornament_dur; neighbor_idx = main_note_idx + random.choice([-1, 1])
-                    mordent_note = copy.deepcopy(event); mordent_note.update({'duration': ornament_dur / 2, 'scale_idx': [neighbor_idx], 'freqs': [scale_notes[neighbor_idx]]})
-                    return_note = copy.deepcopy(event); return_note.update({'start_time': event['start_time'] + ornament_dur/2, 'duration': ornament_dur/2})
+                    mordent_note = _copy_event(event); mordent_note.update({'duration': ornament_dur / 2, 'scale_idx': [neighbor_idx], 'freqs': [scale_notes[neighbor_idx]]})
+                    return_note = _copy_event(event); return_note.update({'start_time': event['start_time'] + ornament_dur/2, 'duration': ornament_dur/2})
                     ornamented_events.insert(-1, mordent_note); ornamented_events.insert(-1, return_note); ornament_times.append(event['start_time'])
             elif ornament_type == 'turn' and 0 < main_note_idx < len(scale_notes) - 1:
                 turn_duration = min(event['duration'], beat_duration / 2)
@@ -1392,7 +1738,7 @@ class HarmonizerApp:
                     note_dur = turn_duration / 4
                     turn_indices = [main_note_idx + 1, main_note_idx, main_note_idx - 1, main_note_idx]
                     for j, turn_idx in enumerate(turn_indices):
-                        turn_note = copy.deepcopy(event)
+                        turn_note = _copy_event(event)
                         turn_note.update({'start_time': event['start_time'] - turn_duration + (j * note_dur), 'duration': note_dur, 'scale_idx': [turn_idx], 'freqs': [scale_notes[turn_idx]]})
                         ornamented_events.insert(-1, turn_note)
                     ornament_times.append(event['start_time'] - turn_duration)
@@ -1489,6 +1835,7 @@ class HarmonizerApp:
             notes_to_play = [current_note]
             chord_tones_in_octave = [safe_get_note(idx - octave_shift) for idx in chord_indices]
             target_note = safe_get_note(next_chord_indices[0] - octave_shift) if next_chord_indices else root_note_idx
+            choice_rolls, nudge_rolls = np.random.random((2, int(num_beats))).tolist() # One batched draw for every beat of the walk
 
             for beat in range(1, int(num_beats)):
                 last_note = notes_to_play[-1]
@@ -1496,12 +1843,13 @@ class HarmonizerApp:
                 
                 if is_strong_beat:
                     possible_targets = [ct for ct in chord_tones_in_octave if ct != last_note] or chord_tones_in_octave
-                    next_note = random.choice(possible_targets)
+                    next_note = possible_targets[int(choice_rolls[beat] * len(possible_targets))]
                 else:
-                    next_chord_tone_target = min(chord_tones_in_octave, key=lambda x: abs(x - (last_note + np.sign(random.random() - 0.5))))
-                    direction = np.sign(next_chord_tone_target - last_note)
+                    nudge = 1 if nudge_rolls[beat] >= 0.5 else -1
+                    next_chord_tone_target = min(chord_tones_in_octave, key=lambda x: abs(x - (last_note + nudge)))
+                    direction = (next_chord_tone_target > last_note) - (next_chord_tone_target < last_note)
                     if direction != 0: next_note = last_note + direction
-                    else: next_note = last_note + random.choice([-1, 1])
+                    else: next_note = last_note + (1 if choice_rolls[beat] >= 0.5 else -1)
 
                 current_note = safe_get_note(next_note)
                 notes_to_play.append(current_note)
@@ -1744,14 +2092,14 @@ class HarmonizerApp:
             
             if m1_vol_mult > 0:
                 rhythm_phrases_m1, _ = self._get_rhythm_sequence(num_chord_beats, tension=tension * (1.2 if is_reprise else 1.0), persistent_motif=section_rhythmic_motif)
-                beats_elapsed = 0
+                beats_elapsed, phrase_beats = 0, sum(abs(b) for p in rhythm_phrases_m1 for b in p) # Total is fixed for the chord, so it is summed once rather than per note
                 for phrase in rhythm_phrases_m1:
                     contour = random.choice(['rising', 'falling', 'arch', 'valley'])
                     for beat in phrase:
                         duration = abs(beat) * beat_duration
                         if time_m1 >= current_time + chord_duration: continue
                         if beat > 0:
-                            phrase_progress = beats_elapsed / sum(abs(b) for p in rhythm_phrases_m1 for b in p) if sum(abs(b) for p in rhythm_phrases_m1 for b in p) > 0 else 0
+                            phrase_progress = beats_elapsed / phrase_beats if phrase_beats > 0 else 0
                             m1_new_idx, _, _ = self._generate_melodic_note(m1_current_idx, m1_last_idx, selected_scale_notes, chord_indices, 0, 0, scale_type, log_callback, contour, phrase_progress, tension=tension, target_note_idx=target_structural_note, characteristic_note_idx=characteristic_note_idx, pitch_class_set=pitch_class_set)
                             m1_figure = self._build_harmony_figure(m1_new_idx, len(selected_scale_notes), base_scale_len, 0.1, chord_indices)
                             volume = (0.6 + tension * 0.4) * m1_vol_mult
@@ -1767,11 +2115,12 @@ class HarmonizerApp:
                     counterpoint_engine = SpeciesCounterpointEngine(m1_events_this_chord, selected_scale_notes, base_scale_len)
                     melody2_events.extend(counterpoint_engine.generate_first_species(m2_current_idx, self.current_m2_waveform, m2_vol_mult))
                 elif is_heterophonic:
-                    for event in m1_events_this_chord:
+                    split_rolls = np.random.random(len(m1_events_this_chord)).tolist() if is_polyrhythmic else None # One draw per chord for the note-splitting decisions
+                    for event_num, event in enumerate(m1_events_this_chord):
                         if 'scale_idx' not in event or not event['scale_idx']: continue
-                        new_event = copy.deepcopy(event)
-                        if is_polyrhythmic and random.random() < 0.4 and new_event['duration'] > beat_duration * 0.4:
-                            new_event['duration'] /= 2; second_note_event = copy.deepcopy(new_event); second_note_event['start_time'] += new_event['duration']; melody2_events.append(second_note_event)
+                        new_event = _copy_event(event)
+                        if is_polyrhythmic and split_rolls[event_num] < 0.4 and new_event['duration'] > beat_duration * 0.4:
+                            new_event['duration'] /= 2; second_note_event = _copy_event(new_event); second_note_event['start_time'] += new_event['duration']; melody2_events.append(second_note_event)
                         if is_polytonal:
                             closest_poly_freq = min(polytonal_scale_notes, key=lambda f: abs(f - selected_scale_notes[new_event['scale_idx'][0]])); new_event['scale_idx'] = [polytonal_scale_notes.index(closest_poly_freq)]; new_event['freqs'] = [closest_poly_freq]
                         new_event['volume'] *= (0.7 * m2_vol_mult); new_event['waveform'] = self.current_m2_waveform; melody2_events.append(new_event)
@@ -1891,16 +2240,9 @@ class HarmonizerApp:
         reverb_buffer = np.zeros_like(audio)
         for i in range(delay_samples, len(audio)):
             reverb_buffer[i] = audio[i] + decay * reverb_buffer[i - delay_samples]
-        return np.clip(reverb_buffer, -1.0, 1.0)
+        return np.clip(reverb_buffer, -1.0, 1.0, out=reverb_buffer)
 
 
-    def _apply_hybrid_envelope(self, audio_data, fade_duration_samples):
-        total_samples = len(audio_data); fade_samples = min(fade_duration_samples, total_samples // 2)
-        if fade_samples <= 1: return audio_data
-        audio_data[:fade_samples] *= np.hanning(fade_samples * 2)[:fade_samples]
-        audio_data[total_samples - fade_samples:] *= np.hanning(fade_samples * 2)[fade_samples:]
-        return audio_data
-
     def _intelligently_select_waveforms(self, affect):
         self.update_log(f"Intelligently selecting waveforms for affect: {affect}", 'debug', debug_only=True)
         self.bass_waveform_var.set(random.choice(["Sine", "Square"]))
@@ -2115,7 +2457,9 @@ class HarmonizerApp:
                 drum_data = []
             elif '_reprise' in section_name and original_section_name in section_data_cache:
                 log_callback(f"Using cached data for reprise of '{original_section_name}'", 'debug', debug_only=True)
-                section_data, drum_data = copy.deepcopy(section_data_cache[original_section_name]['section']), copy.deepcopy(section_data_cache[original_section_name]['drums'])
+                cached = section_data_cache[original_section_name]
+                section_data = {part: [_copy_event(event) for event in events] for part, events in cached['section'].items()}
+                drum_data = [_copy_event(event) for event in cached['drums']]
             else:
                 section_data = self._generate_song_section_data(current_key, current_scale_notes, current_key.split(' ', 1)[1], progression_name, section_duration, melody_bpm, log_callback, current_scale_notes_base, texture_type, song_affect, tension=section_tension, is_heterophonic=is_heterophonic, is_reprise=('_reprise' in section_name), is_polyrhythmic=is_polyrhythmic, is_polytonal=is_polytonal, section_profile=section_profile, urlinie_segment=urlinie_segment, pitch_class_set=pitch_class_set)
                 
@@ -2207,22 +2551,132 @@ class HarmonizerApp:
         self.update_log("Finished generating all song data.", 'debug', debug_only=True)
         return full_song_data, full_drum_data, section_log_timeline, 'fade_out', current_time, melody_bpm
     
-    def _normalize_segment(self, segment, target_rms=0.1):
+    def _normalization_gain(self, segment, target_rms=0.1):
+        """Gain that brings segment to target_rms, backed off so its peak stays at 0.99; 1.0 for empty or near-silent segments."""
         if segment.size == 0:
-            return segment
+            return 1.0
         
-        current_rms = np.sqrt(np.mean(segment**2))
+        sumsq, peak = _sumsq_and_absmax_kernel(segment.reshape(-1))
+        current_rms = math.sqrt(sumsq / segment.size)
         if current_rms < 1e-6: 
-            return segment
+            return 1.0
         
+        # RMS gain, backed off to unity peak if the scaled segment would exceed 0.99
         gain = target_rms / current_rms
-        normalized_segment = segment * gain
-        
-        peak = np.max(np.abs(normalized_segment))
-        if peak > 0.99:
-            normalized_segment /= peak
+        if peak * gain > 0.99:
+            gain = 1.0 / peak
             
-        return normalized_segment
+        return gain
+
+    def _mix_segments(self, track, starts, segments, gains, channel_gains=(1.0, 1.0), segment_ids=None, fade_samples=0):
+        """Adds gain-scaled mono segments into a stereo track with a single call into the compiled mix kernel; segments running past either end of the track are trimmed.
+        With segment_ids, segments holds each distinct sound once and event e plays segments[segment_ids[e]]. fade_samples > 1 gives every event a Hann fade-in and fade-out."""
+        if not segments or not len(starts): return
+        lengths = np.array([len(segment) for segment in segments], dtype=np.int64)
+        seg_offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        if segment_ids is not None:
+            segment_ids = np.asarray(segment_ids, dtype=np.int64)
+            lengths, seg_offsets = lengths[segment_ids], seg_offsets[segment_ids]
+        starts, gains = np.asarray(starts, dtype=np.int64), np.asarray(gains, dtype=np.float64)
+        order = np.argsort(starts, kind='stable') # The kernel walks events in start order
+        _mix_events_kernel(track, starts[order], lengths[order], np.concatenate(segments), seg_offsets[order], gains[order], channel_gains[0], channel_gains[1], fade_samples)
+
+    def _event_columns(self, events, default_volume):
+        """Packs event dicts into struct-of-arrays columns: float64 start_time, duration and volume arrays,
+        plus freqs_flat/freqs_off for pitched events, where event i sounds freqs_flat[freqs_off[i]:freqs_off[i + 1]]."""
+        n = len(events)
+        columns = {
+            'start_time': np.fromiter((item['start_time'] for item in events), dtype=np.float64, count=n),
+            'duration': np.fromiter((item['duration'] for item in events), dtype=np.float64, count=n),
+            'volume': np.fromiter((item.get('volume', default_volume) for item in events), dtype=np.float64, count=n),
+        }
+        if n and 'freqs' in events[0]:
+            freq_counts = np.fromiter((len(item['freqs']) for item in events), dtype=np.int64, count=n)
+            columns['freqs_off'] = np.concatenate(([0], np.cumsum(freq_counts)))
+            columns['freqs_flat'] = np.fromiter((f for item in events for f in item['freqs']), dtype=np.float64, count=int(columns['freqs_off'][-1]))
+        return columns
+
+    def _kernels_threadsafe(self):
+        """True when the active Numba threading layer (omp or tbb) accepts parallel launches from several threads; workqueue aborts the process instead."""
+        if self._concurrent_render is None:
+            _layer_probe_kernel(1)
+            self._concurrent_render = numba.threading_layer() != 'workqueue'
+            if not self._concurrent_render: self.update_log("Numba is using the workqueue threading layer; rendering parts one after another.", 'debug', debug_only=True)
+        return self._concurrent_render
+
+    def _get_bufs(self, total_samples):
+        """Returns zeroed stereo render buffers of the given length as views into pooled buffers, which only grow when a longer song comes along."""
+        if self._render_bufs is None or len(self._render_bufs['master']) < total_samples:
+            self._render_bufs = {name: np.zeros((total_samples, 2), dtype=np.float32) for name in ('melody', 'harmony', 'drums', 'master')}
+            return dict(self._render_bufs)
+        bufs = {name: buf[:total_samples] for name, buf in self._render_bufs.items()}
+        for buf in bufs.values(): buf.fill(0)
+        return bufs
+
+    def _render_harmonic(self, stem_tracks, full_song_data, pan_values, sample_rate):
+        """Synthesizes every pitched event and mixes it into its part's stem."""
+        fade_samples = int(0.005 * sample_rate)
+        for part_name, events in full_song_data.items():
+            self.update_log(f"Rendering audio for part: {part_name}", 'debug', debug_only=True)
+            if not events: continue
+            track = stem_tracks[self.PART_STEMS[part_name]]
+            pan = pan_values.get(part_name, 0.0)
+            channel_gains = (math.sqrt(0.5 * (1 - pan)), math.sqrt(0.5 * (1 + pan)))
+            # Bass has nothing near the top of the spectrum, so it can optionally be synthesized at a lower rate
+            synth_rate = self.BASS_SAMPLE_RATE if part_name == 'bass' and self.BASS_SAMPLE_RATE else sample_rate
+
+            # Pull the per-event scalars into columns once so timing and gain maths run as vector ops
+            n = len(events)
+            columns = self._event_columns(events, 0.7)
+            waveforms = [item['waveform'] for item in events]
+            freqs = [item['freqs'] for item in events]
+            durations, volumes, freqs_off = columns['duration'], columns['volume'], columns['freqs_off']
+            start_samples = (columns['start_time'] * sample_rate).astype(np.int64)
+            first_freqs = np.where(freqs_off[1:] > freqs_off[:-1], np.append(columns['freqs_flat'], 440.0)[freqs_off[:-1]], 440.0)
+            is_resonant = np.fromiter((w in self.RESONANT_WAVEFORMS for w in waveforms), dtype=bool, count=n)
+            has_rolloff = np.fromiter((w in self.ROLLOFF_WAVEFORMS for w in waveforms), dtype=bool, count=n)
+
+            # Back to Python scalars for the per-note loop; NumPy float64 scalars would also upcast the float32 segments
+            effective_durations = np.where(is_resonant & (durations < self.MIN_RESONANT_DURATION), self.MIN_RESONANT_DURATION, durations).tolist()
+            amplitude_factors = np.where(has_rolloff, (440.0 / np.maximum(440.0, first_freqs)) ** 0.3, 1.0).tolist()
+            start_samples, volumes = start_samples.tolist(), volumes.tolist()
+
+            # Cached tones are mixed as they are: normalization and rolloff fold into each event's gain and the kernel applies the edge fades,
+            # so repeats only add an event pointing at their tone and the whole part is mixed in one kernel call
+            tone_ids, tones, tone_gains = {}, [], []
+            starts, segment_ids, gains = [], [], []
+            for i in range(n):
+                key = self._tone_key(effective_durations[i], synth_rate, freqs[i], waveforms[i]) # Events that would get the same cached tone share one segment
+                tone_id = tone_ids.get(key)
+                if tone_id is None:
+                    tone, tone_gain = self._tone_template(key, effective_durations[i], synth_rate, freqs[i], waveforms[i], sample_rate)
+                    tone_id = -1
+                    if tone.size:
+                        tone_id = len(tones); tones.append(tone); tone_gains.append(tone_gain)
+                    tone_ids[key] = tone_id
+                if tone_id < 0: continue
+                starts.append(start_samples[i]); segment_ids.append(tone_id); gains.append(volumes[i] * amplitude_factors[i] * tone_gains[tone_id])
+            self._mix_segments(track, starts, tones, gains, channel_gains, segment_ids, fade_samples)
+
+    def _render_drums(self, drum_track, full_drum_data, sample_rate):
+        """Mixes every drum hit into the drum stem."""
+        self.update_log("Rendering audio for drums", 'debug', debug_only=True)
+        columns = self._event_columns(full_drum_data, 1.0)
+        start_samples, volumes = (columns['start_time'] * sample_rate).astype(np.int64).tolist(), columns['volume'].tolist()
+        hit_ids, hits, hit_gains = {}, [], []
+        starts, segment_ids, gains = [], [], []
+        for i, item in enumerate(full_drum_data):
+            key = (item['drum_type'], item['duration'])
+            hit_id = hit_ids.get(key)
+            if hit_id is None:
+                hit = self._generate_percussion_sound(item['drum_type'], item['duration'], sample_rate).astype(np.float32, copy=False)
+                hit_id = -1
+                if hit.size:
+                    hit_id = len(hits); hits.append(hit); hit_gains.append(self._normalization_gain(hit, target_rms=0.15))
+                hit_ids[key] = hit_id
+            if hit_id < 0: continue
+            starts.append(start_samples[i]); segment_ids.append(hit_id); gains.append(volumes[i] * hit_gains[hit_id])
+        self._mix_segments(drum_track, starts, hits, gains, segment_ids=segment_ids)
 
     def _music_generation_and_playback_thread(self, initial_melody_volume, initial_harmony_volume, initial_drum_volume, on_finish_callback):
         try:
@@ -2242,11 +2696,12 @@ class HarmonizerApp:
             ir_length = int(SAMPLE_RATE * 1.5)
             soundboard_ir = (np.random.rand(ir_length, 2) - 0.5) * 0.1
             soundboard_ir *= np.linspace(1, 0, ir_length)[:, np.newaxis]**2
+            soundboard_ir = soundboard_ir.astype(np.float32)
             
-            part_tracks = {part: np.zeros((total_samples, 2), dtype=np.float64) for part in full_song_data.keys()}
-            drum_track = np.zeros((total_samples, 2), dtype=np.float64)
-            fade_samples = int(0.005 * SAMPLE_RATE)
-            
+            # Parts are mixed straight into their playback stems; no per-part full-length tracks are kept
+            bufs = self._get_bufs(total_samples)
+            stem_tracks = {stem: bufs[stem] for stem in set(self.PART_STEMS.values())}
+            drum_track = bufs['drums']
             pan_values = {
                 'melody1': self.m1_pan_slider.get() / 100.0 if self.ui_mode else -0.2,
                 'melody2': self.m2_pan_slider.get() / 100.0 if self.ui_mode else 0.2,
@@ -2254,54 +2709,24 @@ class HarmonizerApp:
                 'chords': self.chord_pan_slider.get() / 100.0 if self.ui_mode else 0.0,
             }
             
-            for part_name, events in full_song_data.items():
-                self.update_log(f"Rendering audio for part: {part_name}", 'debug', debug_only=True)
-                track = part_tracks[part_name]
-                for item in events:
-                    effective_duration = item['duration']
-                    if item['waveform'] in self.RESONANT_WAVEFORMS and item['duration'] < self.MIN_RESONANT_DURATION:
-                        effective_duration = self.MIN_RESONANT_DURATION
-                    
-                    raw_segment = self._generate_tone(effective_duration, SAMPLE_RATE, item['freqs'], item['waveform'])
-                    if raw_segment.size == 0: continue
-                    normalized_segment = self._normalize_segment(raw_segment)
-                    amplitude_factor = 1.0; ref_freq = 440.0
-                    if item['waveform'] in ['Square', 'Sawtooth', 'Triangle', 'Rich Saw', 'Violin', 'Guitar']:
-                        rolloff_exponent = 0.3; frequency = item['freqs'][0] if item['freqs'] else ref_freq
-                        amplitude_factor = (ref_freq / max(ref_freq, frequency)) ** rolloff_exponent
-
-                    final_segment = self._apply_hybrid_envelope(normalized_segment * amplitude_factor, fade_samples)
-
-                    pan = pan_values.get(part_name, 0.0)
-                    left_gain = math.sqrt(0.5 * (1 - pan))
-                    right_gain = math.sqrt(0.5 * (1 + pan))
-                    stereo_segment = np.column_stack((final_segment * left_gain, final_segment * right_gain))
-
-                    start_s, end_s = int(item['start_time'] * SAMPLE_RATE), int(item['start_time'] * SAMPLE_RATE) + len(stereo_segment)
-                    if start_s < 0 or end_s > total_samples: continue
-                    track[start_s:end_s] += stereo_segment * item.get('volume', 0.7)
-            
-            self.update_log("Rendering audio for drums", 'debug', debug_only=True)
-            for item in full_drum_data:
-                raw_segment = self._generate_percussion_sound(item['drum_type'], item['duration'], SAMPLE_RATE)
-                if raw_segment.size == 0: continue
-                normalized_segment = self._normalize_segment(raw_segment, target_rms=0.15)
-                
-                stereo_segment = np.column_stack((normalized_segment, normalized_segment))
-
-                start_s, end_s = int(item['start_time'] * SAMPLE_RATE), int(item['start_time'] * SAMPLE_RATE) + len(stereo_segment)
-                if start_s < 0 or end_s > total_samples: continue
-                if drum_track[start_s:end_s].shape == stereo_segment.shape: drum_track[start_s:end_s] += stereo_segment * item.get('volume', 1.0)
-                else: self.update_log(f"Debug: Shape mismatch. Slice: {drum_track[start_s:end_s].shape}, Segment: {stereo_segment.shape}", 'debug', debug_only=True)
+            # Each stem is its own buffer, so the melody parts, the harmony parts and the drums render concurrently; NumPy/SciPy and the nogil kernels drop the GIL.
+            # Parts sharing a stem stay on one worker, since their mixes write to the same samples. Under workqueue everything renders on this thread instead
+            stem_parts = {}
+            for part_name, events in full_song_data.items(): stem_parts.setdefault(self.PART_STEMS[part_name], {})[part_name] = events
+            render_jobs = [functools.partial(self._render_harmonic, stem_tracks, parts, pan_values, SAMPLE_RATE) for parts in stem_parts.values()]
+            render_jobs.append(functools.partial(self._render_drums, drum_track, full_drum_data, SAMPLE_RATE))
+            if self._kernels_threadsafe():
+                with ThreadPoolExecutor(max_workers=len(render_jobs)) as executor:
+                    for future in [executor.submit(job) for job in render_jobs]: future.result()
+            else:
+                for job in render_jobs: job()
             
             self.update_log("Mixing audio tracks...", 'debug', debug_only=True)
-            melody_track = part_tracks['melody1'] + part_tracks['melody2']
-            harmony_track = part_tracks['bass'] + part_tracks['chords']
+            melody_track, harmony_track = stem_tracks['melody'], stem_tracks['harmony']
             
             # --- Mixdown and Master Effects ---
-            master_pre_effects = (melody_track * initial_melody_volume) + \
-                                 (harmony_track * initial_harmony_volume) + \
-                                 (drum_track * initial_drum_volume)
+            master_pre_effects = bufs['master']
+            _mixdown_kernel(melody_track, harmony_track, drum_track, initial_melody_volume, initial_harmony_volume, initial_drum_volume, master_pre_effects)
 
             # Apply soundboard convolution
             master_with_soundboard = signal.convolve(master_pre_effects, soundboard_ir, mode='same')
@@ -2309,83 +2734,159 @@ class HarmonizerApp:
             master_with_reverb = self._apply_reverb(master_with_soundboard, SAMPLE_RATE)
 
             if ending_style == 'fade_out': master_with_reverb = self._apply_fade_out(master_with_reverb, 4.0, SAMPLE_RATE)
-            master_audio = np.tanh(master_with_reverb * 1.2) # Soft clipping/limiter
+            # Soft clipping/limiter, in place: the reverb output is this run's own float32 buffer, and it is kept as-is for replay and export
+            master_with_reverb *= 1.2
+            master_audio = np.tanh(master_with_reverb, out=master_with_reverb)
+            master_audio.setflags(write=False)
             self.last_master_audio = master_audio
             
             self.update_log("Preparing audio for playback...", 'debug', debug_only=True)
             
             def to_pygame_sound(stereo_track): 
-                clipped_track = np.clip(stereo_track, -1.0, 1.0)
-                int_track = (clipped_track * 32767.0).astype(np.int16)
-                return pygame.sndarray.make_sound(int_track)
+                # make_sound copies the samples, so all three stems (and later runs of the same length) share one int16 buffer
+                if self._int16_scratch.shape != stereo_track.shape: self._int16_scratch = np.empty(stereo_track.shape, dtype=np.int16)
+                _float_to_int16_kernel(stereo_track, self._int16_scratch)
+                return pygame.sndarray.make_sound(self._int16_scratch)
 
             self.last_melody_sound = to_pygame_sound(melody_track)
             self.last_harmony_sound = to_pygame_sound(harmony_track)
             self.last_drum_sound = to_pygame_sound(drum_track)
 
-            self.melody_channel = pygame.mixer.Channel(0); self.harmony_channel = pygame.mixer.Channel(1); self.drum_channel = pygame.mixer.Channel(2)
-            self.update_melody_volume(self.melody_volume_slider.get()); self.update_harmony_volume(self.harmony_volume_slider.get()); self.update_drum_volume(self.drum_volume_slider.get())
+            self._apply_target_volumes()
             
-            self.melody_channel.play(self.last_melody_sound); self.harmony_channel.play(self.last_harmony_sound); self.drum_channel.play(self.last_drum_sound)
+            self._play_stems()
             
-            log_timeline = []
+            # Each stream is already (nearly) in time order, so the per-stream sorts are linear and the merge is O(N log K)
+            by_start_time = operator.itemgetter('start_time')
+            log_streams = []
             log_map = {'melody1': 'melody1', 'melody2': 'melody2', 'bass': 'bass', 'chords': 'chords'}
             for part, events in full_song_data.items():
                 log_type = log_map.get(part)
                 if not events or not log_type: continue
+                part_log = []
                 for item in events:
                     notes_str = ', '.join(self._find_closest_note_name(f) for f in item['freqs'])
-                    log_timeline.append({'start_time': item['start_time'], 'log_type': log_type, 'message': f"Time: {item['start_time']:.2f}s | {notes_str} ({item['waveform']})"})
+                    part_log.append({'start_time': item['start_time'], 'log_type': log_type, 'message': f"Time: {item['start_time']:.2f}s | {notes_str} ({item['waveform']})"})
+                log_streams.append(sorted(part_log, key=by_start_time))
             
-            for item in full_drum_data: 
-                log_timeline.append({'start_time': item['start_time'], 'log_type': 'drums', 'message': f"Time: {item['start_time']:.2f}s | Drum: {item['drum_type']}"})
-
-            log_timeline.extend(section_log_timeline)
-            log_timeline.sort(key=lambda x: x['start_time'])
+            log_streams.append(sorted(({'start_time': item['start_time'], 'log_type': 'drums', 'message': f"Time: {item['start_time']:.2f}s | Drum: {item['drum_type']}"} for item in full_drum_data), key=by_start_time))
+            log_streams.append(sorted(section_log_timeline, key=by_start_time))
+            log_timeline = list(heapq.merge(*log_streams, key=by_start_time))
             
             self.update_log("--- Starting Playback ---", 'main')
-            start_playback_time, log_index = time.time(), 0
-            
-            while (self.melody_channel.get_busy() or self.harmony_channel.get_busy() or self.drum_channel.get_busy()) and not self.stop_event.is_set():
-                elapsed_time = time.time() - start_playback_time
-                while log_index < len(log_timeline) and elapsed_time >= log_timeline[log_index]['start_time']:
-                    entry = log_timeline[log_index]; self.update_log(entry['message'], entry['log_type']); log_index += 1
-                time.sleep(0.01)
-            self.update_log("--- Playback Finished ---", 'main')
+            # The whole timeline goes to the Tk thread in one queue item; this worker never calls Tk itself
+            self._log_queue.put(functools.partial(self._start_log_timeline, log_timeline, on_finish_callback))
 
         except Exception: 
             self.update_log(f"An unexpected error occurred:\n{traceback.format_exc()}", 'main')
             self.update_log(f"Full traceback:\n{traceback.format_exc()}", 'debug', debug_only=True)
-        finally:
-            if self.melody_channel: self.melody_channel.stop()
-            if self.harmony_channel: self.harmony_channel.stop()
-            if self.drum_channel: self.drum_channel.stop()
-            if self.ui_mode: self.master.after(0, on_finish_callback)
+            self._log_queue.put(functools.partial(self._finish_playback, on_finish_callback))
+
+    def _start_log_timeline(self, log_timeline, on_finish_callback):
+        """Hands the playback log entries to Tk's scheduler up front and starts polling for the end of playback. Runs on the Tk thread,
+        so a Stop pressed before it ran is seen here and a Stop pressed after it cancels every id it registered."""
+        if self.stop_event.is_set(): self._finish_playback(on_finish_callback); return
+        self._log_after_ids = [self.master.after(int(entry['start_time'] * 1000), lambda e=entry: self.update_log(e['message'], e['log_type'])) for entry in log_timeline]
+        self.master.after(50, self._check_playback_done, on_finish_callback)
+
+    def _check_playback_done(self, on_finish_callback):
+        """Polls the playback channels from the Tk event loop until they fall silent or stop is pressed."""
+        if (self.melody_channel.get_busy() or self.harmony_channel.get_busy() or self.drum_channel.get_busy()) and not self.stop_event.is_set():
+            self.master.after(50, self._check_playback_done, on_finish_callback); return
+        self.update_log("--- Playback Finished ---", 'main')
+        self._finish_playback(on_finish_callback)
+
+    def _finish_playback(self, on_finish_callback):
+        """Cancels pending log entries, stops the playback channels and hands control back to the UI."""
+        self._cancel_log_timeline()
+        if self.melody_channel: self.melody_channel.stop()
+        if self.harmony_channel: self.harmony_channel.stop()
+        if self.drum_channel: self.drum_channel.stop()
+        if self.ui_mode: self.master.after(0, on_finish_callback)
+
+    def _cancel_log_timeline(self):
+        for after_id in self._log_after_ids: self.master.after_cancel(after_id)
+        self._log_after_ids = []
+
+    def _init_mixer(self):
+        """Opens a stereo mixer with MIXER_BUFFER samples per callback and only the three stem channels, which every playback reuses."""
+        pygame.mixer.pre_init(frequency=44100, size=-16, channels=2, buffer=self.MIXER_BUFFER)
+        pygame.mixer.init()
+        pygame.mixer.set_num_channels(3)
+        self.melody_channel, self.harmony_channel, self.drum_channel = pygame.mixer.Channel(0), pygame.mixer.Channel(1), pygame.mixer.Channel(2)
+
+    def _play_stems(self):
+        """Starts the three stem sounds back to back after dropping anything still playing. pygame takes the audio lock per play,
+        so this is not sample-locked: the calls are microseconds apart, but an audio callback landing between two of them offsets a stem by one MIXER_BUFFER."""
+        self.melody_channel.stop(); self.harmony_channel.stop(); self.drum_channel.stop()
+        self.melody_channel.play(self.last_melody_sound); self.harmony_channel.play(self.last_harmony_sound); self.drum_channel.play(self.last_drum_sound)
 
     def run_headless(self, loop=False):
         print("Headless mode started. Using settings from harmonizer_settings.json")
         try:
-            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=1024)
+            self._init_mixer()
             while True:
                 full_song_data, full_drum_data, section_log_timeline, ending_style, total_duration, melody_bpm = self._generate_full_song()
                 print("\n--- SONG GENERATION FINISHED, NOT IMPLEMENTED FOR HEADLESS PLAYBACK YET ---\n")
-                if not loop: break
-                time.sleep(2)
+                if not loop or self.stop_event.wait(2): break
         except KeyboardInterrupt: print("\nExiting.")
         finally: pygame.mixer.quit()
 
-    def on_closing(self): self._save_settings(); self.stop_event.set(); pygame.mixer.quit(); self.master.destroy() if self.ui_mode else None
+    def on_closing(self):
+        self._flush_settings(background=False); self.stop_event.set()
+        if self.export_thread is not None and self.export_thread.is_alive():
+            # Hide the window rather than leave a dead one up, and let the file finish before the process goes
+            print("Waiting for the export to finish..."); self.master.withdraw(); self.export_thread.join()
+        pygame.mixer.quit(); self.master.destroy() if self.ui_mode else None
+    def _claim_busy(self):
+        """Sets the busy flag and returns True, or returns False if a generation or replay is already running.
+        Only start_music and replay_music call this, both on the Tk thread, so the test-and-set needs no lock."""
+        if self._busy.is_set(): return False
+        self._busy.set(); return True
     def on_playback_finished(self):
-        if self.lock.locked(): self.lock.release()
+        self._busy.clear()
         self.generation_complete = True
         self._safe_reset_ui()
     def update_log(self, text, log_type='main', debug_only=False):
-        if not self.ui_mode: print(f"[{'DEBUG' if debug_only else log_type.upper()}] {text}"); return
+        # Headless instances replace this with _update_log_headless in __init__, so only the Tk path is left here
+        # Debug lines with no debug window to show them are dropped here, before they are queued and discarded on the Tk thread
+        if debug_only and self.debug_log_area is None: return
+        # Worker threads never touch Tk; their lines are queued for the main thread
+        if threading.current_thread() is not threading.main_thread(): self._log_queue.put((text, log_type, debug_only)); return
+        self._write_log(text, log_type, debug_only)
+    def _update_log_headless(self, text, log_type='main', debug_only=False): print(f"[{'DEBUG' if debug_only else log_type.upper()}] {text}")
+    def _drain_log_queue(self):
+        """Writes up to LOG_DRAIN_BATCH queued worker log lines per tick from the Tk main loop, with one insert per widget.
+        Callables on the queue are Tk work handed over by a worker; they run in order, after the lines queued before them."""
+        lines = []
+        for _ in range(self.LOG_DRAIN_BATCH):
+            try: item = self._log_queue.get_nowait()
+            except queue.Empty: break
+            if not callable(item): lines.append(item); continue
+            if lines: self._write_log_lines(lines); lines = []
+            item()
+        if lines: self._write_log_lines(lines)
+        self.master.after(self.LOG_DRAIN_INTERVAL_MS, self._drain_log_queue)
+    def _write_log(self, text, log_type, debug_only): self._write_log_lines([(text, log_type, debug_only)])
+    def _write_log_lines(self, lines):
+        """Appends (text, log_type, debug_only) lines to the debug window and their part widgets, joining each widget's lines into a single insert."""
         if self.debug_window and self.debug_window.winfo_exists():
-            self.debug_log_area.configure(state='normal'); self.debug_log_area.insert(tk.END, f"[{log_type.upper()}] {text}\n"); self.debug_log_area.configure(state='disabled'); self.debug_log_area.see(tk.END)
-        if debug_only: return
-        widget = {'main': self.main_log_area, 'melody1': self.melody1_log_area, 'melody2': self.melody2_log_area, 'bass': self.bass_log_area, 'chords': self.chord_log_area, 'drums': self.drum_log_area}.get(log_type)
-        if widget: widget.configure(state='normal'); widget.insert(tk.END, text + "\n", log_type); widget.configure(state='disabled'); widget.see(tk.END)
+            self.debug_log_area.insert(tk.END, ''.join(f"[{log_type.upper()}] {text}\n" for text, log_type, _ in lines)); self._trim_log_widget(self.debug_log_area); self.debug_log_area.see(tk.END)
+        widget_lines = {}
+        for text, log_type, debug_only in lines:
+            if not debug_only: widget_lines.setdefault(log_type, []).append(text)
+        if not widget_lines: return
+        for log_type, texts in widget_lines.items():
+            widget = self._log_widgets.get(log_type)
+            if widget: widget.insert(tk.END, "\n".join(texts) + "\n", log_type); self._trim_log_widget(widget); widget.see(tk.END)
+    def _make_log_read_only(self, widget):
+        """Leaves a log widget in the normal state, so code inserts without toggling it, while keyboard and mouse edits are swallowed; navigation and copy still work."""
+        widget.bind('<Key>', lambda e: None if e.keysym in self.LOG_NAVIGATION_KEYS or (e.state & 0x4 and e.keysym.lower() in ('c', 'a')) else 'break')
+        for sequence in ('<<Paste>>', '<<PasteSelection>>', '<<Cut>>', '<<Clear>>', '<Button-2>'): widget.bind(sequence, lambda e: 'break')
+    def _trim_log_widget(self, widget):
+        """Deletes the oldest lines of a writable log widget so it holds at most LOG_MAX_LINES, keeping long sessions from slowing Tk's text layout."""
+        num_lines = int(widget.index('end-1c').split('.')[0]) - 1 # Every insert ends in a newline, so the last line is empty
+        if num_lines > self.LOG_MAX_LINES: widget.delete('1.0', f'{num_lines - self.LOG_MAX_LINES + 1}.0')
     def _safe_reset_ui(self):
         self.play_button.config(state=tk.NORMAL); self.replay_button.config(state=tk.NORMAL if self.last_drum_sound is not None else tk.DISABLED)
         self.stop_button.config(state=tk.DISABLED)
@@ -2395,21 +2896,28 @@ class HarmonizerApp:
     def _update_and_save_melody_volume(self, vol): self.update_melody_volume(vol); self._save_settings()
     def _update_and_save_harmony_volume(self, vol): self.update_harmony_volume(vol); self._save_settings()
     def _update_and_save_drum_volume(self, vol): self.update_drum_volume(vol); self._save_settings()
-    def update_melody_volume(self, vol):
-        if self.melody_channel: self.melody_channel.set_volume(float(vol) / 100.0)
-    def update_harmony_volume(self, vol):
-        if self.harmony_channel: self.harmony_channel.set_volume(float(vol) / 100.0)
-    def update_drum_volume(self, vol):
-        if self.drum_channel: self.drum_channel.set_volume(float(vol) / 100.0)
+    def update_melody_volume(self, vol): self._set_target_volume('melody', vol)
+    def update_harmony_volume(self, vol): self._set_target_volume('harmony', vol)
+    def update_drum_volume(self, vol): self._set_target_volume('drums', vol)
+    def _set_target_volume(self, stem, vol):
+        """Records a slider volume; the channels pick it up in one coalesced apply per VOLUME_APPLY_INTERVAL_MS while dragging."""
+        self._target_volumes[stem] = float(vol) / 100.0
+        if self._volume_apply_id is None:
+            self._volume_apply_id = self.master.after(self.VOLUME_APPLY_INTERVAL_MS, self._apply_target_volumes, True)
+    def _apply_target_volumes(self, scheduled=False):
+        """Pushes the recorded volumes to the stem channels. Reads no Tk state, so the playback threads call it too."""
+        if scheduled: self._volume_apply_id = None
+        for channel, stem in ((self.melody_channel, 'melody'), (self.harmony_channel, 'harmony'), (self.drum_channel, 'drums')):
+            if channel: channel.set_volume(self._target_volumes[stem])
     def start_music(self):
-        if not self.lock.acquire(blocking=False): self.update_log("Generation already in progress.", 'main'); return
+        if not self._claim_busy(): self.update_log("Generation already in progress.", 'main'); return
         self.generation_complete = False
         self.last_song_data = None
         self.last_drum_data = None
         self.play_button.config(state=tk.DISABLED); self.replay_button.config(state=tk.DISABLED); self.stop_button.config(state=tk.NORMAL)
         self.export_wav_button.config(state=tk.DISABLED); self.export_midi_button.config(state=tk.DISABLED); self.stop_event.clear()
-        for log in [self.main_log_area, self.melody1_log_area, self.melody2_log_area, self.bass_log_area, self.chord_log_area, self.drum_log_area]: log.configure(state='normal'); log.delete('1.0', tk.END); log.configure(state='disabled')
-        if self.debug_log_area: self.debug_log_area.configure(state='normal'); self.debug_log_area.delete('1.0', tk.END); self.debug_log_area.configure(state='disabled')
+        for log in self._log_widgets.values(): log.delete('1.0', tk.END)
+        if self.debug_log_area: self.debug_log_area.delete('1.0', tk.END)
         self.last_melody_sound, self.last_harmony_sound, self.last_drum_sound = None, None, None
         initial_melody_volume = self.melody_volume_slider.get() / 100.0
         initial_harmony_volume = self.harmony_volume_slider.get() / 100.0
@@ -2417,18 +2925,17 @@ class HarmonizerApp:
         self.music_thread = threading.Thread(target=self._music_generation_and_playback_thread, args=(initial_melody_volume, initial_harmony_volume, initial_drum_volume, self.on_playback_finished)); self.music_thread.start()
     def replay_music(self):
         if self.last_drum_sound is None: self.update_log("No song generated yet.", 'main'); return
-        if not self.lock.acquire(blocking=False): self.update_log("Playback already in progress.", 'main'); return
+        if not self._claim_busy(): self.update_log("Playback already in progress.", 'main'); return
         self.play_button.config(state=tk.DISABLED); self.replay_button.config(state=tk.DISABLED); self.stop_button.config(state=tk.NORMAL); self.stop_event.clear()
         def playback_thread_target(on_finish_callback):
             try:
-                self.melody_channel, self.harmony_channel, self.drum_channel = pygame.mixer.Channel(0), pygame.mixer.Channel(1), pygame.mixer.Channel(2)
-                self.update_melody_volume(self.melody_volume_slider.get())
-                self.update_harmony_volume(self.harmony_volume_slider.get())
-                self.update_drum_volume(self.drum_volume_slider.get())
-                self.melody_channel.play(self.last_melody_sound)
-                self.harmony_channel.play(self.last_harmony_sound)
-                self.drum_channel.play(self.last_drum_sound)
-                while (self.melody_channel.get_busy() or self.harmony_channel.get_busy() or self.drum_channel.get_busy()) and not self.stop_event.is_set(): time.sleep(0.01)
+                self._apply_target_volumes()
+                self._play_stems()
+                # Sleep through the known song length in one wait that Stop cuts short, then poll briefly for the mixer to drain
+                song_length = max(sound.get_length() for sound in (self.last_melody_sound, self.last_harmony_sound, self.last_drum_sound))
+                if not self.stop_event.wait(timeout=song_length):
+                    while self.melody_channel.get_busy() or self.harmony_channel.get_busy() or self.drum_channel.get_busy():
+                        if self.stop_event.wait(timeout=0.1): break
                 self.update_log("Replay Finished.", 'main')
             except Exception as e: self.update_log(f"Error during replay: {e}", 'main')
             finally:
@@ -2437,25 +2944,29 @@ class HarmonizerApp:
                 if self.drum_channel: self.drum_channel.stop()
                 self.master.after(0, on_finish_callback)
         self.music_thread = threading.Thread(target=playback_thread_target, args=(self.on_playback_finished,)); self.music_thread.start()
-    def stop_music(self): self.update_log("Stop pressed.", "debug", debug_only=True); self.stop_event.set()
+    def stop_music(self): self.update_log("Stop pressed.", "debug", debug_only=True); self.stop_event.set(); self._cancel_log_timeline()
     def export_wav_file(self):
         if not self.generation_complete or self.last_master_audio is None: self.update_log("No audio to export.", 'main'); return
         filename = filedialog.asksaveasfilename(defaultextension=".wav", filetypes=[("WAV files", "*.wav")])
         if not filename: return
-        audio_to_save = np.clip(self.last_master_audio, -1.0, 1.0)
-        with wave.open(filename, 'wb') as f:
-            f.setnchannels(2); f.setsampwidth(self.last_bit_depth // 8); f.setframerate(self.last_sample_rate)
-            if self.last_bit_depth == 24:
-                audio_data_int = (audio_to_save * (2**23 - 1)).astype(np.int32)
-                byte_data = bytearray()
-                for l_sample, r_sample in audio_data_int:
-                    byte_data.extend(l_sample.to_bytes(4, byteorder='little', signed=True)[:3])
-                    byte_data.extend(r_sample.to_bytes(4, byteorder='little', signed=True)[:3])
-                f.writeframes(bytes(byte_data))
+        audio, bit_depth, sample_rate = self.last_master_audio, self.last_bit_depth, self.last_sample_rate
+        self._start_export(self.export_wav_button, filename, lambda path: self._write_wav(path, audio, bit_depth, sample_rate), "Exported to", "Error exporting WAV")
+
+    def _write_wav(self, path, audio, bit_depth, sample_rate):
+        with wave.open(path, 'wb') as f:
+            f.setnchannels(2); f.setsampwidth(bit_depth // 8); f.setframerate(sample_rate)
+            # Frames are converted and written a chunk at a time through one reused buffer, so the PCM copy of the song never exists in full
+            num_frames, chunk_frames = len(audio), self.WAV_EXPORT_CHUNK_FRAMES
+            if bit_depth == 24:
+                pcm = np.empty(min(num_frames, chunk_frames) * 2 * 3, dtype=np.uint8)
+                for start in range(0, num_frames, chunk_frames):
+                    frames = audio[start:start + chunk_frames]
+                    _float_to_pcm24_kernel(frames, pcm); f.writeframes(pcm[:frames.size * 3])
             else:
-                audio_data_int16 = (audio_to_save * 32767.0).astype(np.int16)
-                f.writeframes(audio_data_int16.tobytes())
-        self.update_log(f"Exported to {filename}", 'main')
+                pcm = np.empty((min(num_frames, chunk_frames), 2), dtype='<i2')
+                for start in range(0, num_frames, chunk_frames):
+                    frames = audio[start:start + chunk_frames]
+                    _float_to_int16_kernel(frames, pcm); f.writeframes(pcm[:len(frames)])
     
     def export_midi_file(self):
         if not self.generation_complete or not self.last_song_data:
@@ -2467,55 +2978,84 @@ class HarmonizerApp:
             return
         filename = filedialog.asksaveasfilename(defaultextension=".mid", filetypes=[("MIDI files", "*.mid")])
         if not filename: return
-        try:
-            def freq_to_midi(f):
-                if f <= 0: return 0
-                return 69 + 12 * math.log2(f / 440.0)
-
-            midi = MIDIFile(10, deinterleave=False)
-            beat_dur = 60.0 / self.last_melody_bpm
-            midi.addTempo(0, 0, self.last_melody_bpm)
-
-            track_map = {
-                'melody1': {'track': 1, 'channel': 0, 'program': self.MIDI_INSTRUMENTS[self.midi_m1_var.get()]},
-                'melody2': {'track': 2, 'channel': 1, 'program': self.MIDI_INSTRUMENTS[self.midi_m2_var.get()]},
-                'bass':    {'track': 3, 'channel': 2, 'program': self.MIDI_INSTRUMENTS[self.midi_bass_var.get()]},
-                'chords':  {'track': 4, 'channel': 3, 'program': self.MIDI_INSTRUMENTS[self.midi_chord_var.get()]},
-            }
-
-            for part, config in track_map.items():
-                midi.addProgramChange(config['track'], config['channel'], 0, config['program'])
-
-            for part, config in track_map.items():
-                if part in self.last_song_data:
-                    for item in self.last_song_data[part]:
-                        start_beat = item['start_time'] / beat_dur
-                        dur_beats = item['duration'] / beat_dur
-                        if dur_beats <= 0: continue
-                        
-                        volume = int(item.get('volume', 0.7) * 127)
-                        for freq in item['freqs']:
-                            midi_note = int(round(freq_to_midi(freq)))
-                            if 0 < midi_note < 128:
-                                midi.addNote(config['track'], config['channel'], midi_note, start_beat, dur_beats, volume)
-            if self.last_drum_data:
-                drum_track = 9; drum_channel = 9
-                for item in self.last_drum_data:
-                    start_beat = item['start_time'] / beat_dur
-                    dur_beats = item['duration'] / beat_dur
-                    if dur_beats <= 0: continue
-                    volume = int(item.get('volume', 0.8) * 127)
-                    midi_note = self.DRUM_SOUND_PROPERTIES[item['drum_type']]['midi_note']
-                    if 0 < midi_note < 128:
-                        midi.addNote(drum_track, drum_channel, midi_note, start_beat, dur_beats, volume)
-            with open(filename, "wb") as f:
-                midi.writeFile(f)
-            self.update_log(f"Exported MIDI to {filename}", 'main')
-        except Exception as e:
-            self.update_log(f"Error exporting MIDI: {e}", 'main')
-            self.update_log(traceback.format_exc(), 'debug', debug_only=True)
+        # Tk variables are read here on the UI thread; the worker only sees plain values
+        programs = {'melody1': self.MIDI_INSTRUMENTS[self.midi_m1_var.get()], 'melody2': self.MIDI_INSTRUMENTS[self.midi_m2_var.get()],
+                    'bass': self.MIDI_INSTRUMENTS[self.midi_bass_var.get()], 'chords': self.MIDI_INSTRUMENTS[self.midi_chord_var.get()]}
+        song_data, drum_data, melody_bpm = self.last_song_data, self.last_drum_data, self.last_melody_bpm
+        self._start_export(self.export_midi_button, filename, lambda path: self._write_midi(path, song_data, drum_data, melody_bpm, programs), "Exported MIDI to", "Error exporting MIDI")
+
+    def _write_midi(self, path, song_data, drum_data, melody_bpm, programs):
+        midi = MIDIFile(10, deinterleave=False)
+        beat_dur = 60.0 / melody_bpm
+        midi.addTempo(0, 0, melody_bpm)
+
+        track_map = {
+            'melody1': {'track': 1, 'channel': 0, 'program': programs['melody1']},
+            'melody2': {'track': 2, 'channel': 1, 'program': programs['melody2']},
+            'bass':    {'track': 3, 'channel': 2, 'program': programs['bass']},
+            'chords':  {'track': 4, 'channel': 3, 'program': programs['chords']},
+        }
 
-    def reload_script(self): self.stop_music(); pygame.mixer.quit(); self.master.destroy(); os.execl(sys.executable, sys.executable, *sys.argv)
+        for part, config in track_map.items():
+            midi.addProgramChange(config['track'], config['channel'], 0, config['program'])
+
+        for part, config in track_map.items():
+            events = song_data.get(part)
+            if not events: continue
+            # Convert every frequency in the part to a MIDI note number, and every event to beats and velocity, in vector ops
+            columns = self._event_columns(events, 0.7)
+            freqs_arr, freqs_off = columns['freqs_flat'], columns['freqs_off']
+            which_item = np.repeat(np.arange(len(events)), np.diff(freqs_off))
+            midi_notes = np.where(freqs_arr > 0, np.rint(69 + 12 * np.log2(np.maximum(freqs_arr, 1e-9) / 440.0)), 0).astype(np.int16)
+            start_beats, dur_beats_all = (columns['start_time'] / beat_dur).tolist(), (columns['duration'] / beat_dur).tolist()
+            volumes = (columns['volume'] * 127).astype(np.int64).tolist()
+            for item_idx, midi_note in zip(which_item.tolist(), midi_notes.tolist()):
+                start_beat, dur_beats, volume = start_beats[item_idx], dur_beats_all[item_idx], volumes[item_idx]
+                if dur_beats <= 0: continue
+                if 0 < midi_note < 128:
+                    midi.addNote(config['track'], config['channel'], midi_note, start_beat, dur_beats, volume)
+        if drum_data:
+            drum_track = 9; drum_channel = 9
+            drum_midi_notes = {drum_type: props['midi_note'] for drum_type, props in self.DRUM_SOUND_PROPERTIES.items()} # One lookup per hit instead of two
+            columns = self._event_columns(drum_data, 0.8)
+            start_beats, dur_beats_all = (columns['start_time'] / beat_dur).tolist(), (columns['duration'] / beat_dur).tolist()
+            volumes = (columns['volume'] * 127).astype(np.int64).tolist()
+            for item, start_beat, dur_beats, volume in zip(drum_data, start_beats, dur_beats_all, volumes):
+                if dur_beats <= 0: continue
+                midi_note = drum_midi_notes[item['drum_type']]
+                if 0 < midi_note < 128:
+                    midi.addNote(drum_track, drum_channel, midi_note, start_beat, dur_beats, volume)
+        with open(path, "wb") as f:
+            midi.writeFile(f)
+
+    def _start_export(self, button, filename, write_file, done_message, error_message):
+        """Runs write_file(path) on a worker thread with the export button disabled. The file is written next to filename as '.part'
+        and renamed into place once complete, so the UI stays responsive and an interrupted export never leaves a truncated file behind."""
+        button.config(state=tk.DISABLED)
+        def export_thread_target():
+            part_path = filename + ".part"
+            try:
+                write_file(part_path)
+                os.replace(part_path, filename)
+                self.update_log(f"{done_message} {filename}", 'main')
+            except Exception as e:
+                self.update_log(f"{error_message}: {e}", 'main')
+                self.update_log(traceback.format_exc(), 'debug', debug_only=True)
+                if os.path.exists(part_path): os.remove(part_path)
+        self.export_thread = threading.Thread(target=export_thread_target); self.export_thread.start()
+        self._watch_export(button, self.export_thread)
+
+    def _watch_export(self, button, thread):
+        """Re-enables button once thread is done, polling from the Tk thread so the worker never touches Tk (on_closing may be joining it)."""
+        if thread.is_alive(): self.master.after(self.EXPORT_POLL_MS, self._watch_export, button, thread)
+        elif self.generation_complete: button.config(state=tk.NORMAL) # A generation started meanwhile keeps the buttons disabled until it finishes
+
+    def reload_script(self):
+        """Restarts the script in a fresh process. A fresh process is what recovers a wedged worker or mixer, so this still execs rather than resetting in place,
+        but mixer shutdown (which can stall for seconds on some audio servers) only gets MIXER_QUIT_TIMEOUT before the process image is replaced anyway."""
+        self.stop_music(); self._flush_settings(background=False)
+        mixer_quit = threading.Thread(target=pygame.mixer.quit, daemon=True); mixer_quit.start(); mixer_quit.join(self.MIXER_QUIT_TIMEOUT)
+        self.master.destroy(); os.execl(sys.executable, sys.executable, *sys.argv)
 
 if __name__ == "__main__":
     if '--no-ui' in sys.argv: